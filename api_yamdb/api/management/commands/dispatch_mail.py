@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from users.mailing import dispatch_pending
+
+
+class Command(BaseCommand):
+    """Команда для отправки писем из очереди:
+     python manage.py dispatch_mail [--once] """
+
+    help = 'Отправка писем из очереди исходящей почты'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить накопившиеся письма и завершиться',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Количество писем на одно SMTP-соединение',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Количество попыток отправки одного письма',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками пустой очереди, с',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = dispatch_pending(
+                    options['batch_size'], options['max_attempts']
+                )
+            except Exception as error:
+                self.stderr.write(f'Ошибка соединения с почтой: {error}')
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, отложено: {failed}'
+                )
+            if options['once'] and not sent:
+                return
+            if not sent:
+                time.sleep(options['interval'])
@@ -0,0 +1,172 @@
+import json
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from reviews.models import Comment, Review
+from users.models import User
+
+# Запросы каждого эндпоинта api/v1 с типичными фильтрами.
+ENDPOINTS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?year={year}',
+    '/api/v1/titles/?category={category}',
+    '/api/v1/titles/?genre={genre}',
+    '/api/v1/titles/{title_id}/',
+    '/api/v1/categories/',
+    '/api/v1/genres/',
+    '/api/v1/users/',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/titles/{title_id}/reviews/?pagination=cursor',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    '?pagination=cursor',
+)
+
+# В SQLite полный проход по таблице выглядит как "SCAN <таблица>"
+# без "USING INDEX".
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?!.*USING)')
+
+# Ответы и счетчики из кэша не доходят до базы, и проверять было бы
+# нечего, поэтому команда работает без кэша.
+NO_CACHE = {'default': {
+    'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+}}
+
+
+def sample_params():
+    """Значения для URL из существующих данных."""
+    comment = Comment.objects.select_related(
+        'review__title__category'
+    ).first()
+    review = comment.review if comment else Review.objects.select_related(
+        'title__category'
+    ).first()
+    if review is None:
+        return None
+    title = review.title
+    genre = title.genre.first()
+    return {
+        'title_id': title.id,
+        'review_id': review.id,
+        'year': title.year,
+        'category': title.category.slug if title.category else '',
+        'genre': genre.slug if genre else '',
+    }
+
+
+def postgresql_scans(plan):
+    scans = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Node Type') == 'Seq Scan':
+            scans.append(node.get('Relation Name'))
+        nodes.extend(node.get('Plans', ()))
+    return scans
+
+
+def sequential_scans(sql, params, use_index):
+    """Таблицы, которые запрос читает полным проходом."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            if use_index:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return postgresql_scans(plan[0]['Plan'])
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [
+                match.group(1) for match in (
+                    SQLITE_SCAN.match(row[-1]) for row in cursor.fetchall()
+                ) if match
+            ]
+    raise CommandError(f'EXPLAIN для {connection.vendor} не поддерживается')
+
+
+class Command(BaseCommand):
+    """Команда для проверки планов запросов API:
+     python manage.py explain_queries [--fail-on-seqscan] """
+
+    help = 'EXPLAIN запросов эндпоинтов API с поиском полных проходов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--allow-seqscan',
+            action='store_true',
+            help='Не запрещать планировщику PostgreSQL полные проходы: '
+                 'на маленьких таблицах они дешевле индекса',
+        )
+        parser.add_argument(
+            '--fail-on-seqscan',
+            action='store_true',
+            help='Завершаться с ошибкой, если найден полный проход',
+        )
+
+    def capture(self, client, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        if response.status_code != 200:
+            self.stderr.write(f'{url}: статус {response.status_code}')
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+        ]
+
+    def explain(self, client, url, options):
+        """Число запросов эндпоинта с полным проходом или None без них."""
+        self.stdout.write(url)
+        queries = self.capture(client, url)
+        if not queries:
+            self.stdout.write(self.style.WARNING(
+                '  нет запросов к базе, план не проверен'
+            ))
+            return None
+        flagged = 0
+        for sql in queries:
+            # Захваченный SQL уже содержит подставленные параметры.
+            scans = sequential_scans(sql, None, not options['allow_seqscan'])
+            if scans:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(
+                    f'  полный проход по {", ".join(scans)}: {sql}'
+                ))
+            elif options['verbosity'] > 1:
+                self.stdout.write(f'  индекс: {sql}')
+        return flagged
+
+    def handle(self, *args, **options):
+        params = sample_params()
+        if params is None:
+            raise CommandError('Нет данных: загрузите хотя бы один отзыв')
+        admin = User.objects.filter(role='admin').first()
+        client = APIClient()
+        if admin is not None:
+            client.force_authenticate(user=admin)
+        flagged = 0
+        unchecked = []
+        with override_settings(CACHES=NO_CACHE):
+            for url in ENDPOINTS:
+                url = url.format(**params)
+                scans = self.explain(client, url, options)
+                if scans is None:
+                    unchecked.append(url)
+                else:
+                    flagged += scans
+        if options['fail_on_seqscan']:
+            if flagged:
+                raise CommandError(f'Запросов с полным проходом: {flagged}')
+            if unchecked:
+                raise CommandError(
+                    'Эндпоинты без запросов к базе: ' + ', '.join(unchecked)
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено эндпоинтов: {len(ENDPOINTS) - len(unchecked)} '
+            f'из {len(ENDPOINTS)}, запросов с полным проходом: {flagged}'
+        ))
@@ -0,0 +1,145 @@
+import csv
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from ..generator import SCALES, CatalogGenerator
+from ..loader import CSV_TABLES, TableLoader, deferred_constraints, finish_load
+
+COUNTS = ('users', 'categories', 'genres', 'titles', 'reviews', 'comments')
+
+
+class Command(BaseCommand):
+    """Команда для генерации синтетического каталога:
+     python manage.py generate_data [--scale small] [--seed 0]
+     [--output db|csv] [--path data/] """
+
+    help = 'Генерация пользователей, произведений, отзывов и комментариев'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            choices=sorted(SCALES),
+            default='tiny',
+            help='Готовый масштаб каталога',
+        )
+        for name in COUNTS:
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                help='Количество строк вместо заданного масштабом',
+            )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора: при одном зерне данные совпадают',
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для популярности',
+        )
+        parser.add_argument(
+            '--output',
+            choices=('db', 'csv'),
+            default='db',
+            help='Записать строки в базу данных или в csv файлы',
+        )
+        parser.add_argument(
+            '--path',
+            help='Каталог для csv файлов в формате import_csv',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество строк в одной пачке записи',
+        )
+
+    def report_table(self, table, rows, seconds):
+        if self.verbosity:
+            self.stdout.write(
+                f'{table}: {rows} строк за {seconds:.1f} с '
+                f'({rows / seconds if seconds else 0:.0f} строк/с)'
+            )
+
+    def write_csv(self, generator, path):
+        os.makedirs(path, exist_ok=True)
+        for table in CSV_TABLES:
+            started = time.monotonic()
+            rows = 0
+            with open(
+                os.path.join(path, table.filename), 'w',
+                encoding='utf-8', newline=''
+            ) as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(table.columns)
+                for row in generator.rows(table.model):
+                    writer.writerow(row)
+                    rows += 1
+            self.report_table(
+                table.filename, rows, time.monotonic() - started
+            )
+
+    def load_table(self, table, generator, batch_size):
+        loader = TableLoader(
+            table.model, table.columns,
+            batch_size=batch_size, on_conflict='fail',
+        )
+        try:
+            stats = loader.load(generator.rows(table.model))
+        except IntegrityError as error:
+            raise CommandError(
+                f'Ошибка записи {table.model._meta.db_table}: {error}'
+            )
+        self.report_table(stats.table, stats.rows, stats.seconds)
+
+    def write_db(self, generator, batch_size):
+        models = [table.model for table in CSV_TABLES]
+        for model in models:
+            if model.objects.exists():
+                raise CommandError(
+                    f'Таблица {model._meta.db_table} не пуста: '
+                    'сгенерированные id пересекутся с существующими'
+                )
+        try:
+            with deferred_constraints(models):
+                for table in CSV_TABLES:
+                    self.load_table(table, generator, batch_size)
+        except IntegrityError as error:
+            raise CommandError(str(error))
+        finish_load(models)
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        counts = dict(SCALES[options['scale']])
+        for name in COUNTS:
+            if options[name] is not None:
+                counts[name] = options[name]
+        # Без пользователей, категорий, жанров и произведений
+        # не к чему привязать остальные строки.
+        if min(counts[name] for name in COUNTS[:4]) < 1 or min(
+            counts['reviews'], counts['comments']
+        ) < 0:
+            raise CommandError('Недопустимое количество строк')
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пачки должен быть положительным')
+        if options['output'] == 'csv' and not options['path']:
+            raise CommandError('Для вывода в csv нужен --path')
+        started = time.monotonic()
+        generator = CatalogGenerator(
+            seed=options['seed'], skew=options['skew'], **counts
+        )
+        if options['output'] == 'csv':
+            self.write_csv(generator, options['path'])
+        else:
+            self.write_db(generator, options['batch_size'])
+        if self.verbosity:
+            self.stdout.write(self.style.SUCCESS(
+                f'Сгенерировано отзывов {generator.reviews}, комментариев '
+                f'{generator.comments} за {time.monotonic() - started:.1f} с'
+            ))
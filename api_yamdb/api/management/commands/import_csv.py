@@ -1,109 +1,172 @@
-import csv
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
+import django
+from django.apps import apps
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
-from users.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, connections
+
+from ..loader import (CSV_TABLES, TableLoader, deferred_constraints,
+                      finish_load, read_csv_rows, table_dependencies)
+
+
+def init_worker():
+    """Отдельный процесс загрузки открывает собственное соединение с БД."""
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def load_table(index, path, loader_options, progress=None):
+    table = CSV_TABLES[index]
+    loader = TableLoader(
+        table.model, table.columns, progress=progress, **loader_options
+    )
+    try:
+        return loader.load(read_csv_rows(path))
+    except IntegrityError as error:
+        raise CommandError(f'Ошибка загрузки {table.filename}: {error}')
 
 
 class Command(BaseCommand):
     """Команда для загрузки csv файлов в базу данных:
-     python manage.py fill_database """
+     python manage.py import_csv [--batch-size 5000] [--workers 4] """
 
     help = 'Загрузка информации из csv файлов в базу данных'
 
-    def fill_user(self):
-        with open(os.path.join(settings.BASE_DIR, 'static/data/users.csv'),
-                  'rt', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            for row in reader:
-                if row[0] != 'id':
-                    User.objects.get_or_create(
-                        id=row[0],
-                        username=row[1],
-                        email=row[2],
-                        role=row[3],
-                        bio=row[4],
-                        first_name=row[5],
-                        last_name=row[6]
-                    )
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static/data'),
+            help='Каталог с csv файлами',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество строк в одной пачке записи',
+        )
+        parser.add_argument(
+            '--on-conflict',
+            choices=('skip', 'fail'),
+            default='skip',
+            help='Пропускать уже существующие строки или прерывать загрузку',
+        )
+        parser.add_argument(
+            '--method',
+            choices=('auto', 'bulk', 'copy'),
+            default='auto',
+            help='Способ записи: COPY для PostgreSQL или bulk_create',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Пропускать строки с id не больше уже загруженного',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help='Количество процессов для параллельной загрузки таблиц',
+        )
 
-    def fill_category(self):
-        with open(os.path.join(settings.BASE_DIR, 'static/data/category.csv'),
-                  'r', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            for row in reader:
-                if row[0] != 'id':
-                    Category.objects.get_or_create(
-                        id=row[0], name=row[1], slug=row[2]
-                    )
+    def report_progress(self, model, rows, started):
+        if self.verbosity > 1:
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'  {model._meta.db_table}: {rows} строк, '
+                f'{rows / elapsed if elapsed else rows:.0f} строк/с'
+            )
 
-    def fill_genre(self):
-        with open(os.path.join(settings.BASE_DIR, 'static/data/genre.csv'),
-                  'r', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            for row in reader:
-                if row[0] != 'id':
-                    Genre.objects.get_or_create(
-                        id=row[0], name=row[1], slug=row[2]
-                    )
+    def report_table(self, stats):
+        self.stdout.write(
+            f'{stats.table}: обработано {stats.rows}, '
+            f'пропущено {stats.skipped} за {stats.seconds:.1f} с '
+            f'({stats.rows / stats.seconds if stats.seconds else 0:.0f}'
+            ' строк/с)'
+        )
 
-    def fill_titles(self):
-        with open(os.path.join(settings.BASE_DIR, 'static/data/titles.csv'),
-                  'rt', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            for row in reader:
-                if row[0] != 'id':
-                    Title.objects.get_or_create(
-                        id=row[0], name=row[1], year=row[2], category_id=row[3]
-                    )
-
-    def fill_genre_title(self):
-        with open(
-                os.path.join(settings.BASE_DIR, 'static/data/genre_title.csv'),
-                'r',
-                encoding='utf-8'
-        ) as csv_file:
-            reader = csv.reader(csv_file)
-            for row in reader:
-                if row[0] != 'id':
-                    GenreTitle.objects.get_or_create(
-                        id=row[0], title_id=row[1], genre_id=row[2]
-                    )
+    def load_sequential(self, jobs, dependencies, loader_options):
+        loaded = set()
+        waiting = dict(jobs)
+        while waiting:
+            ready = [
+                index for index in waiting
+                if dependencies[CSV_TABLES[index].model] <= loaded
+            ]
+            if not ready:
+                raise CommandError('Циклическая зависимость таблиц')
+            for index in ready:
+                self.report_table(load_table(
+                    index, waiting.pop(index), loader_options,
+                    self.report_progress
+                ))
+                loaded.add(CSV_TABLES[index].model)
 
-    def fill_review(self):
-        with open(os.path.join(settings.BASE_DIR, 'static/data/review.csv'),
-                  'r', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            for row in reader:
-                if row[0] != 'id':
-                    Review.objects.get_or_create(
-                        id=row[0],
-                        title_id=row[1],
-                        text=row[2],
-                        author_id=row[3],
-                        score=row[4]
-                    )
-
-    def fill_comments(self):
-        with open(os.path.join(settings.BASE_DIR, 'static/data/comments.csv'),
-                  'r', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            for row in reader:
-                if row[0] != 'id':
-                    Comment.objects.get_or_create(
-                        id=row[0],
-                        review_id=row[1],
-                        text=row[2],
-                        author_id=row[3],
-                    )
+    def load_parallel(self, jobs, dependencies, loader_options, workers):
+        """
+        Запускает таблицу, как только загружены все таблицы,
+        на которые она ссылается внешними ключами.
+        """
+        loaded = set()
+        waiting = dict(jobs)
+        running = {}
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+            while waiting or running:
+                for index, path in list(waiting.items()):
+                    if dependencies[CSV_TABLES[index].model] <= loaded:
+                        future = pool.submit(
+                            load_table, index, path, loader_options
+                        )
+                        running[future] = index
+                        del waiting[index]
+                if not running:
+                    raise CommandError('Циклическая зависимость таблиц')
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    self.report_table(future.result())
+                    loaded.add(CSV_TABLES[index].model)
 
     def handle(self, *args, **options):
-        self.fill_user()
-        self.fill_category()
-        self.fill_genre()
-        self.fill_titles()
-        self.fill_genre_title()
-        self.fill_review()
-        self.fill_comments()
+        self.verbosity = options['verbosity']
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пачки должен быть положительным')
+        jobs = {}
+        for index, table in enumerate(CSV_TABLES):
+            path = os.path.join(options['path'], table.filename)
+            if os.path.exists(path):
+                jobs[index] = path
+            else:
+                self.stdout.write(f'Файл {path} не найден, пропускаем')
+        models = [CSV_TABLES[index].model for index in jobs]
+        dependencies = {
+            model: related & set(models)
+            for model, related in table_dependencies(CSV_TABLES).items()
+        }
+        loader_options = {
+            'batch_size': options['batch_size'],
+            'on_conflict': options['on_conflict'],
+            'method': options['method'],
+            'resume': options['resume'],
+        }
+        # SQLite не допускает параллельных транзакций на запись.
+        workers = options['workers'] if connection.vendor != 'sqlite' else 1
+        started = time.monotonic()
+        try:
+            with deferred_constraints(models):
+                if workers > 1:
+                    self.load_parallel(
+                        jobs, dependencies, loader_options, workers
+                    )
+                else:
+                    self.load_sequential(jobs, dependencies, loader_options)
+        except IntegrityError as error:
+            raise CommandError(str(error))
+        finish_load(models)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка завершена за {time.monotonic() - started:.1f} с'
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from reviews.models import Title
+
+from ...v1.versions import bump_version
+
+
+class Command(BaseCommand):
+    """Команда для пересчета рейтингов произведений:
+     python manage.py rebuild_ratings [--verify] """
+
+    help = 'Пересчет хранимых рейтингов произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Только проверить агрегаты, ничего не изменяя',
+        )
+
+    def handle(self, *args, **options):
+        stale = Title.objects.with_stale_ratings().count()
+        if options['verify']:
+            if stale:
+                raise CommandError(
+                    f'Рейтинг устарел у произведений: {stale}'
+                )
+            self.stdout.write(self.style.SUCCESS('Рейтинги актуальны'))
+            return
+        with transaction.atomic():
+            updated = Title.objects.rebuild_ratings()
+            # update() не отправляет сигналов: кэш ответов и ETag
+            # сбрасываются новой версией данных.
+            bump_version(Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано произведений: {updated}, '
+            f'исправлено расхождений: {stale}'
+        ))
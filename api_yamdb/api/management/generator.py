@@ -0,0 +1,236 @@
+import math
+import random
+from bisect import bisect
+from itertools import accumulate
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+# Готовые масштабы каталога; full соответствует боевой базе.
+SCALES = {
+    'tiny': {'users': 200, 'categories': 5, 'genres': 10, 'titles': 100,
+             'reviews': 1000, 'comments': 3000},
+    'small': {'users': 2000, 'categories': 20, 'genres': 50,
+              'titles': 1000, 'reviews': 20000, 'comments': 60000},
+    'medium': {'users': 20000, 'categories': 50, 'genres': 100,
+               'titles': 10000, 'reviews': 500000, 'comments': 2000000},
+    'full': {'users': 200000, 'categories': 100, 'genres': 200,
+             'titles': 100000, 'reviews': 10000000, 'comments': 50000000},
+}
+
+WORDS = (
+    'мир', 'война', 'любовь', 'город', 'ночь', 'море', 'время', 'дом',
+    'звезда', 'дорога', 'тень', 'песня', 'огонь', 'сад', 'зима', 'лето',
+    'память', 'ветер', 'река', 'небо', 'сон', 'путь', 'свет', 'голос',
+)
+
+# Длина описания в словах логнормальна: медиана около 40 слов
+# и длинный хвост до DESCRIPTION_MAX_WORDS; часть описаний пустая.
+DESCRIPTION_MEDIAN_WORDS = 40
+DESCRIPTION_SIGMA = 0.9
+DESCRIPTION_MAX_WORDS = 600
+DESCRIPTION_EMPTY_SHARE = 0.1
+
+# Пачка случайных выборов, чтобы не держать в памяти все комментарии
+# самого популярного произведения.
+CHOICE_BATCH = 10000
+
+
+def zipf_weights(count, skew, rng):
+    """Веса закона Ципфа, случайно распределенные по позициям."""
+    ranks = list(range(1, count + 1))
+    rng.shuffle(ranks)
+    return [rank ** -skew for rank in ranks]
+
+
+def allocate(total, weights, cap=None):
+    """
+    Делит total между позициями пропорционально весам,
+    не давая ни одной больше cap.
+    """
+    counts = [0] * len(weights)
+    active = [index for index, weight in enumerate(weights) if weight]
+    remaining = total
+    while remaining > 0 and active:
+        weight_sum = sum(weights[index] for index in active)
+        given = 0
+        for index in active:
+            share = int(remaining * weights[index] / weight_sum)
+            if cap is not None:
+                share = min(share, cap - counts[index])
+            counts[index] += share
+            given += share
+        remaining -= given
+        if cap is not None:
+            active = [index for index in active if counts[index] < cap]
+        if given == 0:
+            # Остаток меньше числа позиций: по одному самым популярным.
+            active.sort(key=lambda index: -weights[index])
+            for index in active[:remaining]:
+                counts[index] += 1
+            remaining = 0
+    return counts
+
+
+class CatalogGenerator:
+    """
+    Строки таблиц CSV_TABLES для синтетического каталога.
+    Популярность произведений, активность пользователей и частота
+    жанров и категорий подчиняются закону Ципфа с показателем skew.
+    В памяти хранятся только счетчики по произведениям и веса,
+    сами строки отдаются генераторами; при одинаковом seed
+    результат совпадает.
+    """
+
+    def __init__(self, users, categories, genres, titles, reviews,
+                 comments, seed=0, skew=1.1):
+        self.users = users
+        self.categories = categories
+        self.genres = genres
+        self.titles = titles
+        self.seed = seed
+        self.skew = skew
+        rng = self.rng('plan')
+        popularity = zipf_weights(titles, skew, rng)
+        # У произведения не больше users отзывов: автор уникален.
+        self.review_counts = allocate(reviews, popularity, cap=users)
+        self.comment_counts = allocate(comments, [
+            weight if count else 0
+            for weight, count in zip(popularity, self.review_counts)
+        ])
+        self.user_weights = list(accumulate(zipf_weights(users, skew, rng)))
+        self.genre_weights = list(accumulate(zipf_weights(genres, skew, rng)))
+        self.category_weights = list(accumulate(
+            zipf_weights(categories, skew, rng)
+        ))
+
+    @property
+    def reviews(self):
+        return sum(self.review_counts)
+
+    @property
+    def comments(self):
+        return sum(self.comment_counts)
+
+    def rng(self, stream):
+        return random.Random(f'{self.seed}:{stream}')
+
+    def rows(self, model):
+        return {
+            User: self.user_rows,
+            Category: self.category_rows,
+            Genre: self.genre_rows,
+            Title: self.title_rows,
+            GenreTitle: self.genre_title_rows,
+            Review: self.review_rows,
+            Comment: self.comment_rows,
+        }[model]()
+
+    @staticmethod
+    def text(rng, low, high):
+        return ' '.join(
+            rng.choices(WORDS, k=rng.randint(low, high))
+        ).capitalize()
+
+    @staticmethod
+    def description(rng):
+        if rng.random() < DESCRIPTION_EMPTY_SHARE:
+            return ''
+        words = rng.lognormvariate(
+            math.log(DESCRIPTION_MEDIAN_WORDS), DESCRIPTION_SIGMA
+        )
+        count = min(DESCRIPTION_MAX_WORDS, max(1, int(words)))
+        return ' '.join(rng.choices(WORDS, k=count)).capitalize() + '.'
+
+    @staticmethod
+    def pick(rng, cum_weights):
+        """Номер с 1 по накопленным весам."""
+        return bisect(cum_weights, rng.random() * cum_weights[-1]) + 1
+
+    def user_rows(self):
+        rng = self.rng('users')
+        for pk in range(1, self.users + 1):
+            yield (
+                pk, f'user{pk}', f'user{pk}@yamdb.fake',
+                'moderator' if pk % 500 == 0 else 'user',
+                self.text(rng, 0, 20), '', '',
+            )
+
+    def category_rows(self):
+        rng = self.rng('categories')
+        for pk in range(1, self.categories + 1):
+            yield pk, f'{self.text(rng, 1, 2)} {pk}', f'category-{pk}'
+
+    def genre_rows(self):
+        rng = self.rng('genres')
+        for pk in range(1, self.genres + 1):
+            yield pk, f'{self.text(rng, 1, 2)} {pk}', f'genre-{pk}'
+
+    def title_rows(self):
+        rng = self.rng('titles')
+        # Отдельный поток, чтобы описания не меняли остальные столбцы.
+        descriptions = self.rng('descriptions')
+        for pk in range(1, self.titles + 1):
+            # Новых произведений больше, чем старых.
+            year = max(1900, 2023 - int(rng.expovariate(1 / 15)))
+            yield (
+                pk, f'{self.text(rng, 1, 4)} {pk}', year,
+                self.pick(rng, self.category_weights),
+                self.description(descriptions),
+            )
+
+    def genre_title_rows(self):
+        rng = self.rng('genre_titles')
+        pk = 0
+        for title in range(1, self.titles + 1):
+            wanted = min(self.genres, rng.choice((1, 1, 2, 2, 3)))
+            genres = set()
+            while len(genres) < wanted:
+                genres.add(self.pick(rng, self.genre_weights))
+            for genre in sorted(genres):
+                pk += 1
+                yield pk, title, genre
+
+    def authors(self, rng, count):
+        """count разных авторов, активные пользователи чаще."""
+        if count > self.users // 10:
+            return rng.sample(range(1, self.users + 1), count)
+        authors = {}
+        while len(authors) < count:
+            authors.setdefault(self.pick(rng, self.user_weights))
+        return list(authors)
+
+    def review_rows(self):
+        rng = self.rng('reviews')
+        pk = 0
+        for title, count in enumerate(self.review_counts, 1):
+            # У каждого произведения свое среднее качество.
+            quality = rng.gauss(6.5, 1.5)
+            for author in self.authors(rng, count):
+                pk += 1
+                score = min(10, max(1, round(rng.gauss(quality, 1.5))))
+                yield pk, title, self.text(rng, 3, 40), author, score
+
+    def comment_rows(self):
+        rng = self.rng('comments')
+        pk = 0
+        first_review = 1
+        for reviews, comments in zip(self.review_counts, self.comment_counts):
+            if comments:
+                # Первые отзывы произведения обсуждают чаще остальных.
+                cum_weights = list(accumulate(
+                    rank ** -self.skew for rank in range(1, reviews + 1)
+                ))
+                while comments:
+                    batch = min(comments, CHOICE_BATCH)
+                    for offset in rng.choices(
+                        range(reviews), cum_weights=cum_weights, k=batch
+                    ):
+                        pk += 1
+                        yield (
+                            pk, first_review + offset,
+                            self.text(rng, 2, 20),
+                            self.pick(rng, self.user_weights),
+                        )
+                    comments -= batch
+            first_review += reviews
@@ -0,0 +1,280 @@
+import csv
+import io
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import Max
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+from ..v1.versions import bump_version
+
+CsvTable = namedtuple('CsvTable', ('model', 'filename', 'columns'))
+
+# Порядок таблиц учитывает внешние ключи, колонки идут в порядке csv.
+CSV_TABLES = (
+    CsvTable(User, 'users.csv', (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    )),
+    CsvTable(Category, 'category.csv', ('id', 'name', 'slug')),
+    CsvTable(Genre, 'genre.csv', ('id', 'name', 'slug')),
+    # description последним: файлы без него загружаются с пустым описанием.
+    CsvTable(Title, 'titles.csv', (
+        'id', 'name', 'year', 'category_id', 'description'
+    )),
+    CsvTable(GenreTitle, 'genre_title.csv', ('id', 'title_id', 'genre_id')),
+    CsvTable(Review, 'review.csv', (
+        'id', 'title_id', 'text', 'author_id', 'score'
+    )),
+    CsvTable(Comment, 'comments.csv', (
+        'id', 'review_id', 'text', 'author_id'
+    )),
+)
+
+LoadStats = namedtuple('LoadStats', ('table', 'rows', 'skipped', 'seconds'))
+
+
+def read_csv_rows(path):
+    """Построчно читает csv-файл, пропуская строку заголовка."""
+    with open(path, 'r', encoding='utf-8', newline='') as csv_file:
+        for row in csv.reader(csv_file):
+            if row and row[0] != 'id':
+                yield row
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    return str(value).replace('\\', '\\\\').replace(
+        '\t', '\\t'
+    ).replace('\n', '\\n').replace('\r', '\\r')
+
+
+class TableLoader:
+    """
+    Потоковая загрузка строк в одну таблицу пачками:
+    через COPY для PostgreSQL или через bulk_create.
+    """
+
+    def __init__(self, model, columns, batch_size=5000, on_conflict='skip',
+                 method='auto', resume=False, progress=None):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in columns]
+        self.concrete_fields = model._meta.concrete_fields
+        self.batch_size = batch_size
+        self.ignore_conflicts = on_conflict == 'skip'
+        if method == 'auto':
+            method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+        self.method = method
+        self.resume = resume
+        self.progress = progress
+
+    def build(self, row):
+        values = {}
+        for field, value in zip(self.fields, row):
+            if value == '' and field.null:
+                value = None
+            values[field.attname] = field.to_python(value)
+        return self.model(**values)
+
+    def load(self, rows):
+        """Загружает строки в одной транзакции и возвращает статистику."""
+        started = time.monotonic()
+        loaded = skipped = 0
+        last_pk = self._last_pk() if self.resume else None
+        with transaction.atomic():
+            for chunk in chunked(rows, self.batch_size):
+                if last_pk is not None:
+                    size = len(chunk)
+                    chunk = [row for row in chunk if int(row[0]) > last_pk]
+                    skipped += size - len(chunk)
+                if not chunk:
+                    continue
+                self.write([self.build(row) for row in chunk])
+                loaded += len(chunk)
+                if self.progress:
+                    self.progress(self.model, loaded, started)
+        return LoadStats(
+            self.model._meta.db_table, loaded, skipped,
+            time.monotonic() - started
+        )
+
+    def write(self, objs):
+        if self.method == 'copy':
+            self._copy(objs)
+        else:
+            self.model.objects.bulk_create(
+                objs, ignore_conflicts=self.ignore_conflicts
+            )
+
+    def _last_pk(self):
+        return self.model.objects.aggregate(last_pk=Max('pk'))['last_pk']
+
+    def _copy(self, objs):
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        columns = ', '.join(
+            quote(field.column) for field in self.concrete_fields
+        )
+        buffer = io.StringIO()
+        for obj in objs:
+            buffer.write('\t'.join(
+                _copy_value(field.get_db_prep_save(
+                    field.pre_save(obj, True), connection
+                ))
+                for field in self.concrete_fields
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        # Django не оборачивает copy_expert: без wrap_database_errors
+        # ошибка драйвера не стала бы IntegrityError.
+        with connection.cursor() as cursor, connection.wrap_database_errors:
+            if not self.ignore_conflicts:
+                cursor.copy_expert(
+                    f'COPY {table} ({columns}) FROM STDIN', buffer
+                )
+                return
+            staging = quote(f'{self.model._meta.db_table}_import')
+            cursor.execute(
+                f'CREATE TEMP TABLE IF NOT EXISTS {staging} '
+                f'(LIKE {table}) ON COMMIT DROP'
+            )
+            cursor.copy_expert(
+                f'COPY {staging} ({columns}) FROM STDIN', buffer
+            )
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) '
+                f'SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING'
+            )
+            cursor.execute(f'TRUNCATE {staging}')
+
+
+def reset_sequences(models):
+    """Сдвигает счетчики первичных ключей за максимальный загруженный id."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def finish_load(models):
+    """
+    После загрузки: сдвигает счетчики ключей, пересчитывает рейтинги
+    и версии данных, чтобы кэши API увидели новые строки.
+    """
+    reset_sequences(models)
+    with transaction.atomic():
+        Title.objects.rebuild_ratings()
+    for model in {*models, Title}:
+        bump_version(model)
+
+
+def table_dependencies(tables):
+    """Граф внешних ключей между загружаемыми таблицами."""
+    models = {table.model for table in tables}
+    return {
+        table.model: {
+            field.related_model
+            for field in table.model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in models
+            and field.related_model is not table.model
+        }
+        for table in tables
+    }
+
+
+def restore_constraints(indexes, foreign_keys):
+    """
+    Создает индексы и внешние ключи заново и возвращает список ошибок.
+    Ключ добавляется как NOT VALID и только потом проверяется: даже при
+    висячих ссылках в данных он остается на таблице и защищает новые
+    записи, а одна ошибка не мешает восстановить остальные.
+    """
+    quote = connection.ops.quote_name
+    failures = []
+    with connection.cursor() as cursor:
+        for name, definition in indexes:
+            try:
+                cursor.execute(definition)
+            except DatabaseError as error:
+                failures.append(f'индекс {name}: {error}')
+        for table, name, definition in foreign_keys:
+            try:
+                cursor.execute(
+                    f'ALTER TABLE {table} ADD CONSTRAINT {quote(name)} '
+                    f'{definition} NOT VALID'
+                )
+            except DatabaseError as error:
+                failures.append(f'{table}.{name}: {error}')
+                continue
+            try:
+                cursor.execute(
+                    f'ALTER TABLE {table} VALIDATE CONSTRAINT {quote(name)}'
+                )
+            except DatabaseError as error:
+                failures.append(
+                    f'{table}.{name} (остался NOT VALID): {error}'
+                )
+    return failures
+
+
+@contextmanager
+def deferred_constraints(models):
+    """
+    На время загрузки снимает внешние ключи и неуникальные индексы
+    PostgreSQL и создает их заново в конце, в том числе после ошибки
+    загрузки. Вызывается вне транзакции; если восстановить удалось
+    не все, поднимается IntegrityError со списком ошибок.
+    """
+    if connection.vendor != 'postgresql':
+        yield
+        return
+    tables = [model._meta.db_table for model in models]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT conrelid::regclass::text, conname, '
+            'pg_get_constraintdef(oid) FROM pg_constraint '
+            "WHERE contype = 'f' AND conrelid = ANY(%s::regclass[])",
+            [tables],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            'SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) '
+            'FROM pg_index WHERE indrelid = ANY(%s::regclass[]) '
+            'AND NOT indisprimary AND NOT indisunique',
+            [tables],
+        )
+        indexes = cursor.fetchall()
+        for table, name, _ in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE {table} DROP CONSTRAINT '
+                f'{connection.ops.quote_name(name)}'
+            )
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {name}')
+    try:
+        yield
+    finally:
+        failures = restore_constraints(indexes, foreign_keys)
+        if failures:
+            raise IntegrityError(
+                'Не восстановлены ограничения: ' + '; '.join(failures)
+            )
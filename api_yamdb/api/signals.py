@@ -0,0 +1,77 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+from .v1.authentication import forget_token_state
+from .v1.profiling import install_query_timer
+from .v1.versions import bump_version
+
+VERSIONED_MODELS = (Category, Comment, Genre, GenreTitle, Review, Title, User)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_version_on_write(sender, **kwargs):
+    if sender in VERSIONED_MODELS:
+        bump_version(sender)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_version_on_genre_change(sender, **kwargs):
+    bump_version(GenreTitle)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_state_on_user_change(sender, instance, **kwargs):
+    """
+    Состояние токенов сбрасывается после фиксации транзакции: иначе
+    параллельный запрос снова закэширует старую версию и роль.
+    """
+    # После удаления pk экземпляра обнуляется до on_commit.
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_token_state(user_id))
+
+
+@receiver(request_started)
+def check_persistent_connections(sender, **kwargs):
+    """
+    Закрывает переиспользуемые соединения, которые перестали отвечать,
+    чтобы запрос открыл новое, а не упал на разорванном. SELECT 1
+    стоит лишний круг до базы, поэтому проверяются только соединения,
+    простоявшие дольше DB_HEALTH_CHECK_IDLE_SECONDS или еще
+    не отмеченные в конце запроса.
+    """
+    idle_seconds = settings.DB_HEALTH_CHECK_IDLE_SECONDS
+    if idle_seconds is None:
+        return
+    now = time.monotonic()
+    for conn in connections.all():
+        if (
+            conn.connection is not None
+            and not conn.in_atomic_block
+            and now - getattr(conn, 'idle_since', -math.inf) >= idle_seconds
+            and not conn.is_usable()
+        ):
+            conn.close()
+
+
+@receiver(request_finished)
+def mark_idle_connections(sender, **kwargs):
+    now = time.monotonic()
+    for conn in connections.all():
+        if conn.connection is not None:
+            conn.idle_since = now
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    install_query_timer(connection)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+
+TOKEN_STATE_KEY = 'token-state:{}'
+
+
+def get_access_token(user):
+    """Токен доступа с полями, достаточными для проверки прав."""
+    token = AccessToken.for_user(user)
+    token['username'] = user.username
+    token['role'] = user.role
+    token['is_superuser'] = user.is_superuser
+    token['token_version'] = user.token_version
+    return token
+
+
+def get_token_state(user_id):
+    """Версия токенов и активность пользователя с коротким кэшем."""
+    key = TOKEN_STATE_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values_list(
+            'token_version', 'is_active'
+        ).first()
+        cache.set(key, state, settings.JWT_USER_CACHE_TIMEOUT)
+    return state
+
+
+def forget_token_state(user_id):
+    cache.delete(TOKEN_STATE_KEY.format(user_id))
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    Пользователь, собранный из полей токена.
+    Строка из БД загружается только при обращении к остальным полям.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: User.objects.get(pk=user_id))
+        self.__dict__.update(
+            id=user_id,
+            pk=user_id,
+            username=token['username'],
+            role=token['role'],
+            is_superuser=token['is_superuser'],
+        )
+
+    def __bool__(self):
+        return True
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без запроса пользователя к БД.
+    Отзыв токенов и смена роли проверяются по версии токенов.
+    """
+
+    def get_user(self, validated_token):
+        if 'token_version' not in validated_token:
+            return super().get_user(validated_token)
+        state = get_token_state(validated_token[api_settings.USER_ID_CLAIM])
+        if state is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден', code='user_not_found'
+            )
+        token_version, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(
+                'Пользователь заблокирован', code='user_inactive'
+            )
+        if validated_token['token_version'] != token_version:
+            raise AuthenticationFailed(
+                'Токен отозван', code='token_revoked'
+            )
+        return ClaimsUser(validated_token)
@@ -0,0 +1,422 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, connection, transaction
+from django.http import StreamingHttpResponse
+from django.utils.encoding import smart_str
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.validators import UniqueValidator
+
+from .streaming import iter_json_array
+from .versions import bump_version
+
+NOT_FOUND = {'detail': 'Объект не найден.'}
+ROLLED_BACK = {'detail': 'Изменения отменены из-за ошибок в других объектах.'}
+
+
+def sync_many_to_many(field, targets, created=False):
+    """
+    Приводит связи M2M к targets {id объекта: множество id связанных}:
+    одна выборка текущих связей, одно удаление лишних
+    и одна пачка вставки недостающих. У только что созданных
+    объектов (created) связей нет, и выборка пропускается.
+    """
+    if not targets:
+        return
+    through = field.remote_field.through
+    source = field.m2m_field_name() + '_id'
+    target = field.m2m_reverse_field_name() + '_id'
+    stale = []
+    existing = defaultdict(set)
+    if not created:
+        for pk, owner, related in through.objects.filter(
+            **{f'{source}__in': list(targets)}
+        ).values_list('pk', source, target):
+            if related in targets[owner]:
+                existing[owner].add(related)
+            else:
+                stale.append(pk)
+    if stale:
+        through.objects.filter(pk__in=stale).delete()
+    links = [
+        through(**{source: owner, target: related})
+        for owner, related_ids in targets.items()
+        for related in related_ids - existing[owner]
+    ]
+    if links:
+        through.objects.bulk_create(links)
+    if stale or links:
+        # bulk_create не отправляет сигналы, версию данных сдвигаем сами.
+        bump_version(through)
+
+
+class ManySlugRelatedField(serializers.ManyRelatedField):
+    """
+    Список слагов выбирается одним запросом slug__in,
+    а обо всех неизвестных слагах сообщается одной ошибкой.
+    """
+    default_error_messages = {
+        'does_not_exist': 'Не найдены объекты с {slug_name}: {value}.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        relation = self.child_relation
+        if not all(isinstance(slug, str) for slug in data):
+            relation.fail('invalid')
+        slugs = list(dict.fromkeys(data))
+        resolved = relation.resolve(slugs)
+        missing = [slug for slug in slugs if slug not in resolved]
+        if missing:
+            self.fail(
+                'does_not_exist', slug_name=relation.slug_field,
+                value=', '.join(missing)
+            )
+        return [resolved[slug] for slug in slugs]
+
+
+class ResolvedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    Берет объекты по слагам, заранее выбранным BulkListSerializer,
+    а с many=True выбирает весь список одним запросом.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+    def resolve(self, slugs):
+        """Объекты по слагам: из выборки BulkListSerializer или запросом."""
+        resolved = self.context.get('resolved_slugs', {}).get(
+            (self.queryset.model, self.slug_field)
+        )
+        if resolved is not None:
+            return resolved
+        return self.get_queryset().in_bulk(slugs, field_name=self.slug_field)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            return super().to_internal_value(data)
+        try:
+            return self.resolve([data])[data]
+        except KeyError:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Проверка и запись списка объектов с результатом по каждому.
+    Слаги связей и уникальные поля проверяются одним запросом
+    на поле, запись идет через bulk_create и bulk_update.
+    """
+
+    @property
+    def model(self):
+        return self.child.Meta.model
+
+    def slug_relations(self):
+        for name, field in self.child.fields.items():
+            relation = getattr(field, 'child_relation', field)
+            if not field.read_only and isinstance(
+                relation, ResolvedSlugRelatedField
+            ):
+                yield name, relation
+
+    def unique_fields(self):
+        for name, field in self.child.fields.items():
+            for validator in field.validators:
+                if isinstance(validator, UniqueValidator):
+                    yield name, field, validator
+
+    def resolve_slugs(self, items):
+        resolved = {}
+        for name, relation in self.slug_relations():
+            slugs = set()
+            for item in items:
+                value = item.get(name) if isinstance(item, dict) else None
+                for slug in value if isinstance(value, list) else [value]:
+                    if isinstance(slug, str):
+                        slugs.add(slug)
+            key = (relation.queryset.model, relation.slug_field)
+            resolved[key] = relation.get_queryset().in_bulk(
+                slugs, field_name=relation.slug_field
+            )
+        self._context['resolved_slugs'] = resolved
+
+    def taken_values(self, items):
+        """Занятые значения уникальных полей: {поле: {значение: pk}}."""
+        taken = {}
+        for name, field, validator in list(self.unique_fields()):
+            field.validators = [
+                item for item in field.validators if item is not validator
+            ]
+            values = {
+                item[name] for item in items
+                if isinstance(item, dict) and isinstance(item.get(name), str)
+            }
+            taken[field.source] = (validator.message, dict(
+                validator.queryset.filter(
+                    **{f'{field.source}__in': values}
+                ).values_list(field.source, 'pk')
+            ), name)
+        return taken
+
+    def check_unique(self, data, instance, taken):
+        for source, (message, owners, name) in taken.items():
+            if source not in data:
+                continue
+            owner = owners.get(data[source])
+            pk = instance.pk if instance else 0
+            if owner is not None and (not pk or owner != pk):
+                raise ValidationError({name: [message]})
+            owners[data[source]] = pk
+
+    def validate_items(self, items, instances=None):
+        """Список (validated_data, None) или (None, ошибки) по элементам."""
+        self.resolve_slugs(items)
+        taken = self.taken_values(items)
+        results = []
+        for index, item in enumerate(items):
+            instance = instances[index] if instances else None
+            self.child.instance = instance
+            try:
+                if not isinstance(item, dict):
+                    raise ValidationError({
+                        'non_field_errors': ['Ожидается объект.']
+                    })
+                data = self.child.run_validation(item)
+                self.check_unique(data, instance, taken)
+            except ValidationError as error:
+                results.append((None, error.detail))
+            else:
+                results.append((data, None))
+        self.child.instance = None
+        return results
+
+    def split_many_to_many(self, data):
+        return {
+            field: data.pop(field.name)
+            for field in self.model._meta.many_to_many if field.name in data
+        }
+
+    def save_many_to_many(self, objs, relations, created=False):
+        for field in self.model._meta.many_to_many:
+            sync_many_to_many(field, {
+                obj.pk: {related.pk for related in related_objs[field]}
+                for obj, related_objs in zip(objs, relations)
+                if field in related_objs
+            }, created)
+
+    def bulk_create(self, validated):
+        relations = []
+        objs = []
+        for data in validated:
+            data = dict(data)
+            relations.append(self.split_many_to_many(data))
+            objs.append(self.model(**data))
+        if connection.features.can_return_rows_from_bulk_insert:
+            self.model.objects.bulk_create(objs)
+        else:
+            # Без RETURNING id новых строк для связей M2M неизвестны.
+            for obj in objs:
+                obj.save()
+        self.save_many_to_many(objs, relations, created=True)
+        return objs
+
+    def bulk_update(self, instances, validated):
+        relations = []
+        fields = set()
+        for instance, data in zip(instances, validated):
+            data = dict(data)
+            relations.append(self.split_many_to_many(data))
+            for attr, value in data.items():
+                setattr(instance, attr, value)
+            fields.update(data)
+        if fields:
+            self.model.objects.bulk_update(instances, fields)
+        self.save_many_to_many(instances, relations)
+        return instances
+
+
+class BulkWriteMixin:
+    """
+    Массовые create, update и delete списком объектов
+    через POST, PATCH и DELETE на bulk/.
+
+    По умолчанию список пишется в одной транзакции целиком или не пишется
+    вовсе; с параметром transaction=item сохраняются все корректные
+    объекты. Ответ содержит статус и данные или ошибки каждого элемента.
+    """
+    bulk_lookup_field = 'id'
+    bulk_models = ()
+    bulk_max_items = settings.API_BULK_MAX_ITEMS
+
+    @action(
+        detail=False, methods=['post', 'patch', 'delete'],
+        url_path='bulk', url_name='bulk'
+    )
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается список объектов.')
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                f'Не больше {self.bulk_max_items} объектов за запрос.'
+            )
+        per_item = request.query_params.get('transaction') == 'item'
+        if request.method == 'DELETE':
+            results = self.bulk_destroy(items)
+        else:
+            results = self.bulk_write(items, per_item)
+        for model in self.bulk_models:
+            bump_version(model)
+        return self.bulk_response(results)
+
+    def bulk_response(self, results):
+        codes = {result['status'] for result in results}
+        failed = codes - {
+            status.HTTP_200_OK, status.HTTP_201_CREATED,
+            status.HTTP_204_NO_CONTENT,
+        }
+        if not failed:
+            code = status.HTTP_201_CREATED if codes == {
+                status.HTTP_201_CREATED
+            } else status.HTTP_200_OK
+        elif failed == codes:
+            code = status.HTTP_400_BAD_REQUEST
+        else:
+            code = status.HTTP_207_MULTI_STATUS
+        return StreamingHttpResponse(
+            iter_json_array(results), status=code,
+            content_type=JSONRenderer.media_type,
+        )
+
+    def get_bulk_key(self, item):
+        """Значение bulk_lookup_field из элемента, приведенное к типу поля."""
+        if isinstance(item, dict):
+            item = item.get(self.bulk_lookup_field)
+        if not isinstance(item, (str, int)) or isinstance(item, bool):
+            return None
+        field = self.queryset.model._meta.get_field(self.bulk_lookup_field)
+        try:
+            return field.to_python(item)
+        except DjangoValidationError:
+            return None
+
+    def get_bulk_instances(self, keys):
+        return self.queryset.model.objects.in_bulk(
+            {key for key in keys if key is not None},
+            field_name=self.bulk_lookup_field,
+        )
+
+    def bulk_write(self, items, per_item):
+        serializer = self.get_serializer(
+            many=True, partial=self.request.method == 'PATCH'
+        )
+        instances = None
+        if self.request.method == 'PATCH':
+            keys = [self.get_bulk_key(item) for item in items]
+            found = self.get_bulk_instances(keys)
+            instances = [found.get(key) for key in keys]
+        results = serializer.validate_items(items, instances)
+        if instances is not None:
+            results = [
+                (None, NOT_FOUND) if instance is None else result
+                for instance, result in zip(instances, results)
+            ]
+        valid = [
+            index for index, (_, errors) in enumerate(results)
+            if errors is None
+        ]
+        if not per_item and len(valid) < len(results):
+            return [
+                self.bulk_error(errors) if errors else
+                {'status': status.HTTP_424_FAILED_DEPENDENCY,
+                 'errors': ROLLED_BACK}
+                for _, errors in results
+            ]
+        saved = {}
+        try:
+            with transaction.atomic():
+                saved.update(self.bulk_save(
+                    serializer, valid, results, instances
+                ))
+        except IntegrityError as error:
+            if not per_item:
+                raise ValidationError(f'Ошибка записи: {error}')
+            # Повтор по одному объекту, чтобы найти конфликтующие.
+            for index in valid:
+                try:
+                    with transaction.atomic():
+                        saved.update(self.bulk_save(
+                            serializer, [index], results, instances
+                        ))
+                except IntegrityError as error:
+                    results[index] = (None, {'detail': str(error)})
+        return self.bulk_results(serializer, results, saved, instances)
+
+    def bulk_save(self, serializer, indexes, results, instances):
+        validated = [results[index][0] for index in indexes]
+        if instances is None:
+            objs = serializer.bulk_create(validated)
+        else:
+            objs = serializer.bulk_update(
+                [instances[index] for index in indexes], validated
+            )
+        return zip(indexes, objs)
+
+    def bulk_results(self, serializer, results, saved, instances):
+        code = status.HTTP_201_CREATED if instances is None else (
+            status.HTTP_200_OK
+        )
+        fresh = self.get_queryset().in_bulk(
+            [obj.pk for obj in saved.values()]
+        )
+        output = []
+        for index, (_, errors) in enumerate(results):
+            if index in saved:
+                output.append({
+                    'status': code,
+                    'data': serializer.child.to_representation(
+                        fresh[saved[index].pk]
+                    ),
+                })
+            else:
+                output.append(self.bulk_error(errors))
+        return output
+
+    def bulk_error(self, errors):
+        if errors is NOT_FOUND:
+            return {'status': status.HTTP_404_NOT_FOUND, 'errors': errors}
+        return {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors}
+
+    def bulk_destroy(self, items):
+        keys = [self.get_bulk_key(item) for item in items]
+        found = self.get_bulk_instances(keys)
+        with transaction.atomic():
+            self.queryset.model.objects.filter(
+                pk__in=[obj.pk for obj in found.values()]
+            ).delete()
+        return [
+            {self.bulk_lookup_field: item,
+             'status': status.HTTP_204_NO_CONTENT}
+            if key in found else
+            {self.bulk_lookup_field: item,
+             'status': status.HTTP_404_NOT_FOUND, 'errors': NOT_FOUND}
+            for item, key in zip(items, keys)
+        ]
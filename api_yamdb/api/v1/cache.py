@@ -0,0 +1,77 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from .versions import get_validators
+
+
+def response_etag(basename, version, full_path):
+    return '"{}"'.format(md5('{}:{}:{}'.format(
+        basename, version, full_path
+    ).encode()).hexdigest())
+
+
+def anonymous_cache_key(basename, etag):
+    return 'response:{}:anonymous:{}'.format(basename, etag.strip('"'))
+
+
+class CachedResponseMixin:
+    """
+    Условные GET-запросы и кэш ответов list и retrieve.
+    ETag и Last-Modified строятся по версии данных моделей
+    из cache_models, поэтому 304 отдается до выборки и сериализации.
+    Данные ответа кэшируются только для анонимных пользователей.
+    """
+    cache_models = ()
+    cache_timeout = settings.API_RESPONSE_CACHE_TIMEOUT
+
+    def can_cache_response(self, last_modified):
+        """Можно ли сохранить ответ для анонимных пользователей."""
+        return True
+
+    def get_etag(self, request, version):
+        return response_etag(self.basename, version, request.get_full_path())
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.cache_models:
+            return handler(request, *args, **kwargs)
+        version, last_modified = get_validators(*self.cache_models)
+        etag = self.get_etag(request, version)
+        last_modified = int(last_modified)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+        if request.user.is_authenticated:
+            response = handler(request, *args, **kwargs)
+        else:
+            key = anonymous_cache_key(self.basename, etag)
+            data = cache.get(key)
+            if data is None:
+                response = handler(request, *args, **kwargs)
+                if (
+                    response.status_code == status.HTTP_200_OK
+                    and not response.streaming
+                    and self.can_cache_response(last_modified)
+                ):
+                    cache.set(key, response.data, self.cache_timeout)
+            else:
+                response = Response(data)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,126 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .profiling import timing
+
+FIELD, NESTED, MANY = range(3)
+
+
+def identity(value):
+    return value
+
+
+class ValuesSerializer:
+    """
+    Сериализация списков только для чтения напрямую из строк .values().
+    Состав полей и их преобразования один раз берутся из обычного
+    сериализатора, поэтому ответ совпадает с ним байт в байт.
+    """
+
+    def __init__(self, serializer_class, model=None):
+        self.model = model or serializer_class.Meta.model
+        self.columns = []
+        self.plan = []
+        for name, field in serializer_class().fields.items():
+            source = field.source.replace('.', '__')
+            if isinstance(field, serializers.ListSerializer):
+                self.plan.append((name, MANY, (
+                    source, ValuesSerializer(type(field.child))
+                )))
+            elif isinstance(field, serializers.BaseSerializer):
+                nested = ValuesSerializer(type(field))
+                self.columns.append(source)
+                self.columns += [
+                    f'{source}__{column}' for column in nested.columns
+                ]
+                self.plan.append((name, NESTED, (source, nested)))
+            elif isinstance(field, serializers.SlugRelatedField):
+                column = f'{source}__{field.slug_field}'
+                self.columns.append(column)
+                self.plan.append((name, FIELD, (column, identity)))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                self.columns.append(source)
+                self.plan.append((name, FIELD, (source, identity)))
+            else:
+                self.columns.append(source)
+                self.plan.append((name, FIELD, (
+                    source, field.to_representation
+                )))
+
+    def values(self, queryset):
+        """Выборка только колонок, которые попадут в ответ."""
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def represent(self, row, prefix=''):
+        data = {}
+        for name, kind, (source, convert) in self.plan:
+            if kind == FIELD:
+                value = row[prefix + source]
+                data[name] = None if value is None else convert(value)
+            elif kind == NESTED:
+                if row[prefix + source] is None:
+                    data[name] = None
+                else:
+                    data[name] = convert.represent(row, f'{source}__')
+            else:
+                data[name] = row[f'_{source}']
+        return data
+
+    def serialize(self, rows):
+        rows = list(rows)
+        for name, kind, (source, nested) in self.plan:
+            if kind == MANY:
+                self.attach_many(rows, source, nested)
+        return [self.represent(row) for row in rows]
+
+    def attach_many(self, rows, source, nested):
+        """Связанные объекты M2M всех строк одним запросом."""
+        field = self.model._meta.get_field(source)
+        through = field.remote_field.through
+        owner = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        ordering = [
+            f'{target}__{name}'
+            for name in field.related_model._meta.ordering
+        ]
+        related = defaultdict(list)
+        links = through.objects.filter(
+            **{f'{owner}__in': [row['id'] for row in rows]}
+        ).order_by(*ordering).values(owner, *(
+            f'{target}__{column}' for column in nested.columns
+        ))
+        for link in links:
+            related[link[owner]].append(nested.represent(link, f'{target}__'))
+        for row in rows:
+            row[f'_{source}'] = related[row['id']]
+
+
+@lru_cache(maxsize=None)
+def get_values_serializer(serializer_class):
+    return ValuesSerializer(serializer_class)
+
+
+class FastListMixin:
+    """
+    Список только для чтения через ValuesSerializer,
+    если включена настройка API_FAST_READ_SERIALIZERS.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_READ_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+        serializer = get_values_serializer(self.get_serializer_class())
+        queryset = serializer.values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        with timing('serialize'):
+            if page is not None:
+                return self.get_paginated_response(
+                    serializer.serialize(page)
+                )
+            return Response(serializer.serialize(queryset))
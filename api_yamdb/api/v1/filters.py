@@ -1,6 +1,8 @@
 import django_filters
 from reviews.models import Title
 
+from .search import search_titles
+
 
 class TitleFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(
@@ -9,7 +11,11 @@ class TitleFilter(django_filters.FilterSet):
     year = django_filters.NumberFilter(field_name='year')
     genre = django_filters.CharFilter(field_name='genre__slug')
     category = django_filters.CharFilter(field_name='category__slug')
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category')
+        fields = ('name', 'year', 'genre', 'category', 'search')
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
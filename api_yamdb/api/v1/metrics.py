@@ -0,0 +1,168 @@
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+# Верхние границы корзин гистограммы задержки в секундах.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+DURATION = 'yamdb_request_duration_seconds'
+COUNTERS = {
+    'yamdb_db_queries_total': 'Запросы к базе',
+    'yamdb_db_duration_seconds_total': 'Время запросов к базе',
+    'yamdb_serialize_duration_seconds_total': 'Время сериализации',
+    'yamdb_render_duration_seconds_total': 'Время рендеринга ответа',
+}
+
+# Серии нумеруются счетчиком: регистрация новой серии атомарна
+# и не теряется, когда воркеры сбрасывают метрики одновременно.
+SERIES_COUNT_KEY = 'metrics:series'
+SERIES_NAME_KEY = 'metrics:series:{}'
+VALUE_KEY = 'metrics:value:{}'
+
+SERIES = re.compile(r'^(\w+?)(_bucket|_sum|_count)?(\{.*\})$')
+LE = re.compile(r',le="([^"]+)"')
+
+
+def microseconds(seconds):
+    return int(seconds * 1000000)
+
+
+def add_to_series(series, value):
+    """
+    Атомарно прибавляет value к серии. Воркер, создавший ключ серии,
+    добавляет ее в список серий под следующим номером счетчика.
+    """
+    key = VALUE_KEY.format(series)
+    try:
+        cache.incr(key, value)
+        return
+    except ValueError:
+        if not cache.add(key, value, None):
+            cache.incr(key, value)
+            return
+    try:
+        index = cache.incr(SERIES_COUNT_KEY)
+    except ValueError:
+        index = 1
+        if not cache.add(SERIES_COUNT_KEY, index, None):
+            index = cache.incr(SERIES_COUNT_KEY)
+    cache.set(SERIES_NAME_KEY.format(index), series, None)
+
+
+def registered_series():
+    count = cache.get(SERIES_COUNT_KEY) or 0
+    # Серия, вытесненная из кэша, при возврате регистрируется повторно.
+    return list(dict.fromkeys(cache.get_many([
+        SERIES_NAME_KEY.format(index) for index in range(1, count + 1)
+    ]).values()))
+
+
+class MetricsRegistry:
+    """
+    Счетчики и гистограммы запросов. Процесс копит приращения
+    в памяти и раз в API_METRICS_FLUSH_SECONDS добавляет их в кэш
+    через incr, поэтому /metrics/ видит сумму по всем воркерам.
+    Время хранится в микросекундах, чтобы значения оставались целыми.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = defaultdict(int)
+        self.flushed_at = time.monotonic()
+
+    def observe(self, endpoint, method, status, timings):
+        labels = f'endpoint="{endpoint}",method="{method}"'
+        request_labels = f'{{{labels},status="{status}"}}'
+        with self.lock:
+            pending = self.pending
+            for bucket in BUCKETS:
+                if timings.total <= bucket:
+                    pending[
+                        f'{DURATION}_bucket{{{labels},status="{status}",'
+                        f'le="{bucket}"}}'
+                    ] += 1
+            pending[
+                f'{DURATION}_bucket{{{labels},status="{status}",le="+Inf"}}'
+            ] += 1
+            pending[f'{DURATION}_count{request_labels}'] += 1
+            pending[f'{DURATION}_sum{request_labels}'] += microseconds(
+                timings.total
+            )
+            pending[f'yamdb_db_queries_total{{{labels}}}'] += timings.queries
+            for name in ('db', 'serialize', 'render'):
+                pending[
+                    f'yamdb_{name}_duration_seconds_total{{{labels}}}'
+                ] += microseconds(timings.durations[name])
+
+    def flush_due(self):
+        return (
+            time.monotonic() - self.flushed_at
+            >= settings.API_METRICS_FLUSH_SECONDS
+        )
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, defaultdict(int)
+            self.flushed_at = time.monotonic()
+        if not pending:
+            return
+        for series, value in pending.items():
+            add_to_series(series, value)
+
+    def export(self):
+        """Текст в формате экспозиции Prometheus."""
+        self.flush()
+        series = registered_series()
+        values = cache.get_many([VALUE_KEY.format(name) for name in series])
+        families = defaultdict(list)
+        for name in series:
+            family, suffix, _ = SERIES.match(name).groups()
+            value = values.get(VALUE_KEY.format(name), 0)
+            if 'seconds' in family and suffix in (None, '_sum'):
+                value = value / 1000000
+            families[family].append((sort_key(name), name, value))
+        lines = []
+        for family in sorted(families):
+            if family == DURATION:
+                lines.append(f'# HELP {family} Время ответа API')
+                lines.append(f'# TYPE {family} histogram')
+            else:
+                lines.append(f'# HELP {family} {COUNTERS.get(family, "")}')
+                lines.append(f'# TYPE {family} counter')
+            for _, name, value in sorted(families[family]):
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def sort_key(name):
+    """Корзины одной серии идут подряд по возрастанию границы."""
+    match = LE.search(name)
+    if match is None:
+        return (name, 0.0)
+    bound = float('inf') if match.group(1) == '+Inf' else float(
+        match.group(1)
+    )
+    return (LE.sub('', name), bound)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def metrics(request):
+    """
+    Метрики для Prometheus по Bearer-токену API_METRICS_TOKEN.
+    Без токена эндпоинт доступен только с DEBUG.
+    """
+    token = settings.API_METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        raise Http404
+    if token and request.META.get('HTTP_AUTHORIZATION') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(
+        REGISTRY.export(), content_type='text/plain; version=0.0.4'
+    )
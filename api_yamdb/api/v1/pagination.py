@@ -0,0 +1,139 @@
+from collections import OrderedDict
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework import pagination
+from rest_framework.response import Response
+
+from .versions import get_version, related_models
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """Постраничная пагинация с выбором размера страницы клиентом."""
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, получающий общее число объектов от пагинации API."""
+
+    def __init__(self, *args, count_source, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_source = count_source
+
+    @cached_property
+    def count(self):
+        return self.count_source(self.object_list)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Кэширует COUNT(*) по набору фильтров до изменения данных,
+    а для больших таблиц без фильтров в PostgreSQL берет оценку
+    из статистики планировщика.
+    """
+    count_cache_timeout = settings.API_COUNT_CACHE_TIMEOUT
+    estimate_threshold = settings.API_ESTIMATED_COUNT_THRESHOLD
+    count_ignored_params = (
+        'page', 'page_size', 'cursor', 'pagination', 'format'
+    )
+
+    def django_paginator_class(self, object_list, per_page):
+        return CachedCountPaginator(
+            object_list, per_page, count_source=self.get_count
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_exact = True
+        self.count_filters = sorted(
+            (key, sorted(values))
+            for key, values in request.query_params.lists()
+            if key not in self.count_ignored_params
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        """
+        Число объектов из кэша, а при промахе оценка или COUNT(*):
+        оба результата кэшируются под одним ключом до изменения данных.
+        """
+        model = queryset.model
+        key = 'page_count:{}:{}:{}'.format(
+            model._meta.label_lower,
+            get_version(*related_models(model)),
+            md5(urlencode(self.count_filters, doseq=True).encode()).hexdigest()
+        )
+        cached = cache.get(key)
+        if cached is None:
+            count = None
+            if not self.count_filters:
+                count = self.estimate_count(queryset)
+            cached = (
+                (count, False) if count is not None
+                else (queryset.count(), True)
+            )
+            cache.set(key, cached, self.count_cache_timeout)
+        count, self.count_exact = cached
+        return count
+
+    def estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < self.estimate_threshold:
+            return None
+        return row[0]
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_exact', self.count_exact),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class PubDateCursorPagination(pagination.CursorPagination):
+    """
+    Пагинация по курсору от новых записей к старым без OFFSET и COUNT.
+    Совпадающие даты различаются по id.
+    """
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class CursorPaginationMixin:
+    """
+    Включает курсорную пагинацию для всего вьюсета
+    или для запроса с параметром pagination=cursor.
+    """
+    cursor_pagination_class = PubDateCursorPagination
+    use_cursor_pagination = False
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if (
+                self.use_cursor_pagination
+                or params.get('pagination') == 'cursor'
+                or pagination.CursorPagination.cursor_query_param in params
+            ):
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
@@ -47,4 +47,4 @@ class IsAdminModeratorOwnerPermission(permissions.BasePermission):
         return (request.method in permissions.SAFE_METHODS
                 or request.user.role == 'admin'
                 or request.user.role == 'moderator'
-                or obj.author == request.user)
+                or obj.author_id == request.user.id)
@@ -0,0 +1,177 @@
+import asyncio
+import cProfile
+import os
+import random
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+from .metrics import REGISTRY
+
+# Замеры текущего запроса; None вне ProfilingMiddleware.
+TIMINGS = ContextVar('request_timings', default=None)
+
+UNSAFE_FILENAME = re.compile(r'[^\w.-]+')
+
+
+class RequestTimings:
+    """Время этапов запроса в секундах и число запросов к базе."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.queries = 0
+        self.total = 0.0
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def server_timing(self):
+        parts = [
+            f'db;desc="queries: {self.queries}";'
+            f'dur={self.durations["db"] * 1000:.2f}'
+        ]
+        for name in ('serialize', 'render'):
+            parts.append(f'{name};dur={self.durations[name] * 1000:.2f}')
+        parts.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(parts)
+
+
+@contextmanager
+def timing(name):
+    """Добавляет время блока к этапу name текущего запроса."""
+    timings = TIMINGS.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[name] += time.perf_counter() - started
+
+
+def record_query(execute, sql, params, many, context):
+    """Обертка выполнения SQL: число и время запросов к базе."""
+    timings = TIMINGS.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.durations['db'] += time.perf_counter() - started
+
+
+def install_query_timer(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedSerializerMixin:
+    """Время to_representation сериализаторов вьюсета."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+
+        @wraps(to_representation)
+        def timed(instance):
+            with timing('serialize'):
+                return to_representation(instance)
+        serializer.to_representation = timed
+        return serializer
+
+
+def endpoint(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.url_name or match.route
+
+
+def sample_profiler():
+    """cProfile для доли запросов API_PROFILE_SAMPLE_RATE."""
+    rate = settings.API_PROFILE_SAMPLE_RATE
+    if rate and random.random() < rate:
+        return cProfile.Profile()
+    return None
+
+
+def dump_profile(profiler, label, timings):
+    """Сохраняет статистику cProfile медленного запроса."""
+    milliseconds = timings.total * 1000
+    if milliseconds < settings.API_PROFILE_SLOW_MS:
+        return None
+    os.makedirs(settings.API_PROFILE_DIR, exist_ok=True)
+    path = os.path.join(settings.API_PROFILE_DIR, '{}-{}-{:.0f}ms.prof'.format(
+        int(time.time() * 1000), UNSAFE_FILENAME.sub('_', label),
+        milliseconds
+    ))
+    profiler.dump_stats(path)
+    return path
+
+
+def finish_request(request, response, timings):
+    timings.finish()
+    label = endpoint(request)
+    if label != 'metrics':
+        REGISTRY.observe(
+            label, request.method, response.status_code, timings
+        )
+    if settings.API_SERVER_TIMING:
+        response['Server-Timing'] = timings.server_timing()
+    return label
+
+
+def profiling_middleware(get_response):
+    """
+    Время запроса по этапам: база, сериализация, рендеринг и всего.
+    Отдается в Server-Timing и копится в метриках для /metrics/.
+    Синхронные запросы из выборки профилируются cProfile, и
+    медленные сохраняются в API_PROFILE_DIR.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            timings = RequestTimings()
+            token = TIMINGS.set(timings)
+            try:
+                response = await get_response(request)
+            finally:
+                TIMINGS.reset(token)
+            finish_request(request, response, timings)
+            if REGISTRY.flush_due():
+                await asyncio.get_running_loop().run_in_executor(
+                    None, REGISTRY.flush
+                )
+            return response
+    else:
+        def middleware(request):
+            timings = RequestTimings()
+            token = TIMINGS.set(timings)
+            profiler = sample_profiler()
+            try:
+                if profiler is not None:
+                    profiler.enable()
+                response = get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                TIMINGS.reset(token)
+            label = finish_request(request, response, timings)
+            if profiler is not None:
+                dump_profile(profiler, label, timings)
+            if REGISTRY.flush_due():
+                REGISTRY.flush()
+            return response
+    return middleware
+
+
+profiling_middleware.sync_capable = True
+profiling_middleware.async_capable = True
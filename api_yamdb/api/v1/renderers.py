@@ -0,0 +1,70 @@
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+from .profiling import timing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(value):
+    """Типы, которые orjson не знает, приводятся как в JSONEncoder DRF."""
+    return JSONEncoder().default(value)
+
+
+def dumps(data):
+    """
+    Компактный JSON в UTF-8, совпадающий с выводом JSONRenderer:
+    через orjson, если он установлен, иначе стандартным json.
+    """
+    if orjson is not None:
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # JSONRenderer экранирует разделители строк для JavaScript.
+            if b'\xe2\x80' in ret:
+                ret = ret.replace(
+                    b'\xe2\x80\xa8', b'\\u2028'
+                ).replace(b'\xe2\x80\xa9', b'\\u2029')
+            return ret
+    return renderers.JSONRenderer().render(data)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer на orjson. Ответы с отступами для браузера
+    и окружение без orjson обслуживает стандартный рендерер.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        with timing('render'):
+            return dumps(data)
+
+
+class ORJSONParser(parsers.JSONParser):
+    """JSONParser на orjson для тел запросов в UTF-8."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,79 @@
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+# База для чтения в текущем запросе; None означает основную.
+READ_DATABASE = ContextVar('read_database', default=None)
+
+STICKY_KEY = 'replica:primary:{}'
+
+
+class PrimaryReplicaRouter:
+    """
+    Чтения идут в реплику, выбранную для запроса ReplicaReadMixin,
+    запись и миграции всегда в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return READ_DATABASE.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaReadMixin:
+    """
+    Безопасные запросы вьюсета читают из случайной реплики.
+    После записи пользователь на DB_REPLICA_STICKY_SECONDS остается
+    на основной базе, чтобы видеть свои изменения. Привязка хранится
+    в общем кэше, поэтому видна всем воркерам. Ответ реплики на только
+    что измененные таблицы из cache_models не кэшируется: отставшая
+    реплика могла вернуть данные до записи под новой версией.
+    """
+
+    def use_replica(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return False
+        user = request.user
+        return not (
+            user.is_authenticated and cache.get(STICKY_KEY.format(user.pk))
+        )
+
+    def can_cache_response(self, last_modified):
+        if hasattr(self, '_read_database') and (
+            time.time() - last_modified < settings.DB_REPLICA_STICKY_SECONDS
+        ):
+            return False
+        return super().can_cache_response(last_modified)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and self.use_replica(request):
+            self._read_database = READ_DATABASE.set(
+                random.choice(settings.DATABASE_REPLICAS)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if hasattr(self, '_read_database'):
+            READ_DATABASE.reset(self._read_database)
+            del self._read_database
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            cache.set(
+                STICKY_KEY.format(request.user.pk), True,
+                settings.DB_REPLICA_STICKY_SECONDS
+            )
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,23 @@
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.db import connections
+from django.db.models import Q
+
+# Должна совпадать с конфигурацией индекса reviews_title_search_idx.
+SEARCH_CONFIG = 'russian'
+
+
+def search_titles(queryset, value):
+    """
+    Полнотекстовый поиск по названию и описанию произведения
+    с сортировкой по релевантности. Вне PostgreSQL ищет подстроку.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.filter(
+            Q(name__icontains=value) | Q(description__icontains=value)
+        )
+    vector = SearchVector('name', 'description', config=SEARCH_CONFIG)
+    query = SearchQuery(value, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.annotate(
+        search=vector, search_rank=SearchRank(vector, query)
+    ).filter(search=query).order_by('-search_rank', 'name')
@@ -1,10 +1,11 @@
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
+from .bulk import (BulkListSerializer, ResolvedSlugRelatedField,
+                   sync_many_to_many)
 from .utility import username_is_valid
 
 
@@ -14,6 +15,7 @@ class GenreSerializer(serializers.ModelSerializer):
     class Meta:
         exclude = ('id',)
         model = Genre
+        list_serializer_class = BulkListSerializer
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -22,28 +24,29 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         exclude = ('id',)
         model = Category
+        list_serializer_class = BulkListSerializer
 
 
 class TitleSerializer(serializers.ModelSerializer):
     """Сериализатор для произведений."""
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
-    rating = serializers.IntegerField(
-        source='reviews__score__avg', read_only=True
-    )
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id', 'category', 'genre', 'rating', 'name', 'description', 'year'
+        )
+        read_only_fields = ('rating',)
 
 
 class TitleSerializerCreate(serializers.ModelSerializer):
     """Сериализатор для работы с произведениями при создании."""
-    category = serializers.SlugRelatedField(
+    category = ResolvedSlugRelatedField(
         queryset=Category.objects.all(),
         slug_field='slug'
     )
-    genre = serializers.SlugRelatedField(
+    genre = ResolvedSlugRelatedField(
         queryset=Genre.objects.all(),
         slug_field='slug',
         many=True
@@ -51,7 +54,37 @@ class TitleSerializerCreate(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id', 'category', 'genre', 'name', 'description', 'year', 'rating'
+        )
+        read_only_fields = ('rating',)
+        list_serializer_class = BulkListSerializer
+
+    def save_genres(self, title, genres, created=False):
+        """Связи с жанрами пишутся одной пачкой без очистки старых."""
+        if genres is not None:
+            sync_many_to_many(Title.genre.field, {
+                title.pk: {genre.pk for genre in genres}
+            }, created)
+
+    def create(self, validated_data):
+        genres = validated_data.pop('genre', None)
+        title = super().create(validated_data)
+        self.save_genres(title, genres, created=True)
+        return title
+
+    def update(self, instance, validated_data):
+        """
+        Сохраняются только переданные поля: агрегаты рейтинга
+        параллельно сдвигаются отзывами через F() и не перезаписываются.
+        """
+        genres = validated_data.pop('genre', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
+        self.save_genres(instance, genres)
+        return instance
 
 
 class AdminUserSerializer(serializers.ModelSerializer):
@@ -211,18 +244,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if (
-            request.method == 'POST'
-            and Review.objects.filter(title=title, author=author).exists()
-        ):
-            raise ValidationError()
-        return data
-
     class Meta:
         fields = '__all__'
         model = Review
@@ -245,3 +266,10 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = '__all__'
+
+
+class CommentReviewIdSerializer(CommentSerializer):
+    """
+    Сериализатор комментариев с id отзыва вместо его текста.
+    """
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
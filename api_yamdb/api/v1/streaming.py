@@ -0,0 +1,71 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .permissions import IsAdminOrSuperuserPermission
+from .renderers import dumps
+
+
+def iter_json_array(items, chunk_size=100):
+    """Отдает JSON-массив кусками по chunk_size элементов."""
+    yield b'['
+    buffer = []
+    separator = b''
+    for item in items:
+        buffer.append(dumps(item))
+        if len(buffer) >= chunk_size:
+            yield separator + b','.join(buffer)
+            buffer = []
+            separator = b','
+    if buffer:
+        yield separator + b','.join(buffer)
+    yield b']'
+
+
+class StreamingListMixin:
+    """
+    Список без пагинации по параметру pagination=none, только
+    для администраторов: остальным размер ответа ограничивает
+    API_MAX_PAGE_SIZE.
+    Объекты выбираются пачками по первичным ключам, чтобы работал
+    prefetch_related, а ответ отдается StreamingHttpResponse
+    без сборки всей строки в памяти. Под ASGI ответ собирается
+    целиком: Django 3.2 перебирает поток в цикле событий, где
+    ленивые запросы к базе запрещены.
+    """
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('pagination') != 'none':
+            return super().list(request, *args, **kwargs)
+        permission = IsAdminOrSuperuserPermission()
+        if not (
+            request.user.is_authenticated
+            and permission.has_permission(request, self)
+        ):
+            self.permission_denied(request, message=permission.message)
+        queryset = self.filter_queryset(self.get_queryset())
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+        return self.streaming_response(queryset)
+
+    def streaming_response(self, queryset):
+        content = iter_json_array(self.iter_objects(queryset))
+        if isinstance(self.request._request, ASGIRequest):
+            return HttpResponse(
+                b''.join(content), content_type=JSONRenderer.media_type
+            )
+        return StreamingHttpResponse(
+            content, content_type=JSONRenderer.media_type
+        )
+
+    def iter_objects(self, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
+        for start in range(0, len(pks), self.stream_chunk_size):
+            chunk = pks[start:start + self.stream_chunk_size]
+            objs = queryset.filter(pk__in=chunk).in_bulk()
+            yield from self.get_serializer(
+                [objs[pk] for pk in chunk if pk in objs], many=True
+            ).data
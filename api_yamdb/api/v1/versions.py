@@ -0,0 +1,56 @@
+import time
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'data-version:{}'
+
+
+def related_models(model):
+    """Модель и модели, по полям которых фильтруются ее выборки."""
+    models = {model}
+    for field in model._meta.get_fields():
+        if not field.is_relation or field.auto_created:
+            continue
+        models.add(field.related_model)
+        if field.many_to_many:
+            models.add(field.remote_field.through)
+    return models
+
+
+def new_version():
+    """Версия хранит время изменения и случайный суффикс."""
+    return f'{time.time():.6f}:{uuid4().hex[:12]}'
+
+
+def bump_version(model):
+    """
+    Отмечает изменение данных таблицы новой версией после фиксации
+    транзакции: иначе параллельный запрос закэширует под новой версией
+    еще не записанные или откаченные данные.
+    """
+    key = VERSION_KEY.format(model._meta.label_lower)
+    transaction.on_commit(lambda: cache.set(key, new_version(), None))
+
+
+def get_versions(*models):
+    keys = [VERSION_KEY.format(model._meta.label_lower) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in sorted(keys)]
+
+
+def get_version(*models):
+    """Общая версия данных нескольких таблиц."""
+    return '-'.join(get_versions(*models))
+
+
+def get_validators(*models):
+    """Общая версия и время последнего изменения нескольких таблиц."""
+    versions = get_versions(*models)
+    last_modified = max(float(version.split(':')[0]) for version in versions)
+    return '-'.join(versions), last_modified
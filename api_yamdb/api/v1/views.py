@@ -1,34 +1,48 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.mailing import enqueue_mail
 from users.models import User
 
+from .authentication import get_access_token
+from .bulk import BulkWriteMixin
+from .cache import CachedResponseMixin
+from .fast_serializers import FastListMixin
 from .filters import TitleFilter
+from .pagination import CachedCountPagination, CursorPaginationMixin
 from .permissions import (IsAdminModeratorOwnerPermission,
                           IsAdminOrSuperuserPermission, TitlePermission)
+from .profiling import TimedSerializerMixin
+from .replicas import ReplicaReadMixin
 from .serializers import (AdminUserSerializer, CategorySerializer,
-                          CommentSerializer, ConfirmationCodeSerializer,
-                          GenreSerializer, ReviewSerializer, TitleSerializer,
+                          CommentReviewIdSerializer, CommentSerializer,
+                          ConfirmationCodeSerializer, GenreSerializer,
+                          ReviewSerializer, TitleSerializer,
                           TitleSerializerCreate, TokenSerializer,
                           UserSerializer)
+from .streaming import StreamingListMixin
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, CachedResponseMixin, BulkWriteMixin,
+                   StreamingListMixin, FastListMixin, TimedSerializerMixin,
+                   viewsets.ModelViewSet):
     """Вьюсет для произведений."""
-    queryset = Title.objects.all().annotate(
-        Avg("reviews__score")
-    ).order_by('name')
+    cache_models = (Title, Category, Genre, GenreTitle, Review)
+    bulk_models = (Title, GenreTitle)
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
     serializer_class = TitleSerializerCreate
     permission_classes = [TitlePermission]
+    pagination_class = CachedCountPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitleFilter
 
@@ -38,11 +52,17 @@ class TitleViewSet(viewsets.ModelViewSet):
         return TitleSerializer
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, CachedResponseMixin, BulkWriteMixin,
+                      StreamingListMixin, TimedSerializerMixin,
+                      viewsets.ModelViewSet):
     """Вьюсет для категорий."""
+    cache_models = (Category,)
+    bulk_lookup_field = 'slug'
+    bulk_models = (Category, Title)
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
     permission_classes = [TitlePermission]
+    pagination_class = CachedCountPagination
     filter_backends = [filters.SearchFilter]
     search_fields = ('name',)
 
@@ -58,11 +78,17 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_204_NO_CONTENT)
 
 
-class GenreViewSet(viewsets.ModelViewSet):
+class GenreViewSet(ReplicaReadMixin, CachedResponseMixin, BulkWriteMixin,
+                   StreamingListMixin, TimedSerializerMixin,
+                   viewsets.ModelViewSet):
     """Вьюсет для жанров."""
+    cache_models = (Genre,)
+    bulk_lookup_field = 'slug'
+    bulk_models = (Genre, GenreTitle)
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
     permission_classes = [TitlePermission]
+    pagination_class = CachedCountPagination
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
 
@@ -78,15 +104,16 @@ class GenreViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_204_NO_CONTENT)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(TimedSerializerMixin, viewsets.ModelViewSet):
     """Работа с пользователями для администратора."""
     http_method_names = ['get', 'post', 'patch', 'delete']
-    queryset = User.objects.all()
+    queryset = User.objects.order_by('username')
     permission_classes = (
         permissions.IsAuthenticated,
         IsAdminOrSuperuserPermission,
     )
     lookup_field = 'username'
+    pagination_class = CachedCountPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
 
@@ -120,33 +147,38 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def signup(request):
-    serializer = ConfirmationCodeSerializer(data=request.data)
-    if User.objects.filter(username=request.data.get('username'),
-                           email=request.data.get('email')).exists():
+def register_user(data):
+    """Регистрация или новый код подтверждения: данные и статус ответа."""
+    serializer = ConfirmationCodeSerializer(data=data)
+    if User.objects.filter(username=data.get('username'),
+                           email=data.get('email')).exists():
         user, created = User.objects.get_or_create(
-            username=request.data.get('username')
+            username=data.get('username')
         )
         if created is False:
             confirmation_code = default_token_generator.make_token(user)
             user.confirmation_code = confirmation_code
             user.save()
-            return Response('Ваш токен обновлен!', status=status.HTTP_200_OK)
+            return 'Ваш токен обновлен!', status.HTTP_200_OK
     serializer.is_valid(raise_exception=True)
     serializer.save()
     user, created = User.objects.get_or_create(
-        username=request.data.get('username')
+        username=data.get('username')
     )
     confirmation_code = default_token_generator.make_token(user)
     user.confirmation_code = confirmation_code
-    send_mail(f'Привет, {str(user.username)}! Ваш код подтверждения:',
-              confirmation_code,
-              settings.MAILING_EMAIL,
-              [request.data['email']],
-              fail_silently=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    enqueue_mail(f'Привет, {str(user.username)}! Ваш код подтверждения:',
+                 confirmation_code,
+                 settings.MAILING_EMAIL,
+                 [data['email']])
+    return serializer.data, status.HTTP_200_OK
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def signup(request):
+    data, status_code = register_user(request.data)
+    return Response(data, status=status_code)
 
 
 @api_view(http_method_names=['POST', ])
@@ -156,41 +188,106 @@ def token(request):
     serializer.is_valid(raise_exception=True)
     data = serializer.validated_data
     user = get_object_or_404(User, **data)
-    refresh = RefreshToken.for_user(user)
     return Response(
-        {'access': str(refresh.access_token)}, status=status.HTTP_201_CREATED
+        {'access': str(get_access_token(user))},
+        status=status.HTTP_201_CREATED
     )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class NestedResourceMixin:
+    """
+    Вьюсет вложенных ресурсов: дочерние объекты выбираются одним
+    запросом по всем id из URL, а родитель проверяется отдельно,
+    только если список оказался пустым. Вьюсет определяет
+    get_parent(): родительский объект из URL или 404.
+    """
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        data = response.data
+        if not (data.get('results') if isinstance(data, dict) else data):
+            self.get_parent()
+        return response
+
+
+class ReviewViewSet(ReplicaReadMixin, CachedResponseMixin,
+                    CursorPaginationMixin, NestedResourceMixin, FastListMixin,
+                    TimedSerializerMixin, viewsets.ModelViewSet):
     """
     View класс для запросов GET, POST, для списка всех отзывов произведения
     или GET, PUT, PATCH, DELETE для отзывов по id.
     """
+    cache_models = (Review, Title, User)
     serializer_class = ReviewSerializer
     permission_classes = [IsAdminModeratorOwnerPermission]
 
+    def get_parent(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self._title
+
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author', 'title').only(
+            'id', 'text', 'score', 'pub_date',
+            'author', 'author__username', 'title', 'title__name',
+        ).order_by('-pub_date', '-id')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        title = self.get_parent()
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            raise ValidationError(
+                'Вы уже оставили отзыв на это произведение.'
+            )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, CachedResponseMixin,
+                     CursorPaginationMixin, NestedResourceMixin, FastListMixin,
+                     TimedSerializerMixin, viewsets.ModelViewSet):
     """
     View класс для запросов GET, POST, для списка всех комментариев отзыва
     или GET, PUT, PATCH, DELETE для комментариев по id.
     """
+    cache_models = (Comment, Review, User)
     serializer_class = CommentSerializer
     permission_classes = [IsAdminModeratorOwnerPermission]
 
+    def get_parent(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
+
+    def review_as_id(self):
+        """Параметр review_format=id заменяет текст отзыва на его id."""
+        return self.request.query_params.get('review_format') == 'id'
+
+    def get_serializer_class(self):
+        if self.review_as_id():
+            return CommentReviewIdSerializer
+        return CommentSerializer
+
     def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        return review.comments.all()
+        fields = [
+            'id', 'text', 'pub_date', 'author', 'author__username', 'review'
+        ]
+        related = ['author']
+        if not self.review_as_id():
+            fields.append('review__text')
+            related.append('review')
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related(*related).only(*fields).order_by('-pub_date', '-id')
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
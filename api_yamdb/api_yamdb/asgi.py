@@ -3,5 +3,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+# Под ASGI по умолчанию включены асинхронные эндпоинты.
+os.environ.setdefault('API_ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -0,0 +1,9 @@
+from api.v1.async_views import urlpatterns as async_urlpatterns
+from django.urls import include, path
+
+from .urls import urlpatterns as sync_urlpatterns
+
+# Асинхронные эндпоинты перекрывают синхронные с теми же адресами.
+urlpatterns = [
+    path('api/v1/', include(async_urlpatterns)),
+] + sync_urlpatterns
@@ -0,0 +1,129 @@
+"""
+Подготовка процессов gunicorn: прогрев ленивых кэшей Django и DRF
+до fork и замер памяти воркеров.
+"""
+import inspect
+import os
+
+MEMORY_FIELDS = ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty')
+
+
+def compile_patterns(patterns):
+    """Регулярные выражения маршрутов компилируются при первом обращении."""
+    for pattern in patterns:
+        pattern.pattern.regex
+        if hasattr(pattern, 'url_patterns'):
+            compile_patterns(pattern.url_patterns)
+
+
+def read_serializer_classes():
+    """Сериализаторы списков вьюсетов с FastListMixin."""
+    from api.v1.fast_serializers import FastListMixin
+    from api.v1.urls import v1_router
+    from django.http import HttpRequest
+
+    request = HttpRequest()
+    request.method = 'GET'
+    classes = set()
+    for _, viewset, _ in v1_router.registry:
+        if not issubclass(viewset, FastListMixin):
+            continue
+        view = viewset(
+            action_map={'get': 'list'}, format_kwarg=None, kwargs={}
+        )
+        view.request = view.initialize_request(request)
+        classes.add(view.get_serializer_class())
+    return classes
+
+
+def warm_up():
+    """
+    Заполняет кэши маршрутов и полей сериализаторов. В мастере
+    с preload_app воркеры получают их готовыми через copy-on-write.
+    """
+    from api.v1 import serializers as api_serializers
+    from api.v1.fast_serializers import get_values_serializer
+    from django.conf import settings
+    from django.db import connections
+    from django.urls import get_resolver
+    from rest_framework.serializers import BaseSerializer
+    from rest_framework.settings import api_settings
+
+    for urlconf in {settings.ROOT_URLCONF, 'api_yamdb.urls'}:
+        resolver = get_resolver(urlconf)
+        resolver.reverse_dict
+        compile_patterns(resolver.url_patterns)
+    for name in api_settings.defaults:
+        getattr(api_settings, name)
+    for _, serializer_class in inspect.getmembers(
+        api_serializers, inspect.isclass
+    ):
+        if (
+            issubclass(serializer_class, BaseSerializer)
+            and serializer_class.__module__ == api_serializers.__name__
+        ):
+            serializer_class().fields
+    for serializer_class in read_serializer_classes():
+        get_values_serializer(serializer_class)
+    # Соединения с базой не должны переходить в воркеры через fork.
+    connections.close_all()
+
+
+def shared_cache_error(workers):
+    """
+    Версии данных, отозванные токены, привязка к основной базе и метрики
+    хранятся в кэше. Локальный кэш у каждого воркера свой, и запись
+    в одном воркере не видна остальным.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from django.conf import settings
+
+    backend = settings.CACHES['default']['BACKEND']
+    if workers > 1 and backend.endswith('.LocMemCache'):
+        return (
+            f'Воркеров {workers}, а кэш локальный ({backend}): задайте '
+            'REDIS_URL или CACHE_BACKEND=file, либо GUNICORN_WORKERS=1'
+        )
+    return None
+
+
+def memory_usage(pid='self'):
+    """Память процесса в КБ по /proc: RSS, PSS и собственные страницы."""
+    usage = dict.fromkeys(MEMORY_FIELDS, 0)
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as smaps:
+            for line in smaps:
+                name, _, value = line.partition(':')
+                if name in usage:
+                    usage[name] = int(value.split()[0])
+    except OSError:
+        return None
+    usage['Private'] = usage.pop('Private_Clean') + usage.pop(
+        'Private_Dirty'
+    )
+    return usage
+
+
+def format_memory(usage):
+    if usage is None:
+        return 'нет данных /proc'
+    return ', '.join(
+        f'{name.lower()} {value / 1024:.1f} МБ'
+        for name, value in usage.items()
+    )
+
+
+def child_pids(pid):
+    """Дочерние процессы, например воркеры мастера gunicorn."""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as children:
+            return [int(child) for child in children.read().split()]
+    except OSError:
+        return []
+
+
+def cpu_count():
+    """Ядра, доступные процессу с учетом привязки к CPU."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -0,0 +1,96 @@
+"""
+Настройки gunicorn: gunicorn -c gunicorn.conf.py api_yamdb.wsgi:application
+
+Число воркеров и потоков по умолчанию считается от доступных ядер,
+каждое значение переопределяется переменной окружения GUNICORN_*.
+"""
+import gc
+import os
+import sys
+
+from api_yamdb.workers import (cpu_count, format_memory, memory_usage,
+                               shared_cache_error, warm_up)
+
+CPUS = cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', default='0:8000')
+worker_class = os.getenv('WORKER_CLASS', default='sync')
+
+if worker_class.startswith('uvicorn'):
+    # Воркер uvicorn обслуживает соединения в цикле событий.
+    default_workers, default_threads = CPUS, 1
+elif worker_class == 'gthread':
+    default_workers, default_threads = CPUS + 1, 4
+else:
+    default_workers, default_threads = CPUS * 2 + 1, 1
+
+# Каждый поток держит свое соединение с базой (CONN_MAX_AGE),
+# поэтому число воркеров ограничено сверху.
+workers = int(os.getenv('GUNICORN_WORKERS', default=min(
+    default_workers, int(os.getenv('GUNICORN_MAX_WORKERS', default=12))
+)))
+threads = int(os.getenv('GUNICORN_THREADS', default=default_threads))
+
+preload_app = os.getenv('GUNICORN_PRELOAD', default='True') == 'True'
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', default=5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', default=30))
+
+# Перезапуск воркеров ограничивает рост памяти, разброс не дает
+# всем воркерам перезапуститься одновременно.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', default=2000))
+max_requests_jitter = int(os.getenv(
+    'GUNICORN_MAX_REQUESTS_JITTER', default=max_requests // 10
+))
+
+# Сердцебиение воркеров в памяти, а не на диске контейнера.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# Каждые RSS_REPORT_REQUESTS запросов воркер пишет в лог свою память.
+RSS_REPORT_REQUESTS = int(os.getenv('GUNICORN_RSS_REPORT_REQUESTS', 500))
+
+
+def on_starting(server):
+    error = shared_cache_error(server.cfg.workers)
+    if error:
+        server.log.error(error)
+        sys.exit(1)
+
+
+def when_ready(server):
+    if preload_app:
+        warm_up()
+        # Объекты мастера не попадают в сборку мусора воркеров,
+        # и их страницы не копируются после fork.
+        gc.freeze()
+    server.log.info('Мастер %s: %s', os.getpid(), format_memory(
+        memory_usage()
+    ))
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        warm_up()
+    worker.served_requests = 0
+    worker.log.info('Воркер %s запущен: %s', worker.pid, format_memory(
+        memory_usage()
+    ))
+
+
+def post_request(worker, req, environ, resp):
+    worker.served_requests += 1
+    if RSS_REPORT_REQUESTS and (
+        worker.served_requests % RSS_REPORT_REQUESTS == 0
+    ):
+        worker.log.info(
+            'Воркер %s после %s запросов: %s', worker.pid,
+            worker.served_requests, format_memory(memory_usage())
+        )
+
+
+def worker_exit(server, worker):
+    server.log.info(
+        'Воркер %s завершен после %s запросов: %s', worker.pid,
+        getattr(worker, 'served_requests', 0), format_memory(memory_usage())
+    )
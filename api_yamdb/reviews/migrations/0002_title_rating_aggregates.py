@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-17 05:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    count = Subquery(reviews.annotate(count=Count('pk')).values('count'))
+    total = Subquery(reviews.annotate(total=Sum('score')).values('total'))
+    Title.objects.update(
+        reviews_count=Coalesce(count, 0),
+        score_sum=Coalesce(total, 0),
+        rating=total / count,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(
+            fill_rating_aggregates, migrations.RunPython.noop
+        ),
+    ]
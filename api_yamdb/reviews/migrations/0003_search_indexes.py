@@ -0,0 +1,51 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# icontains в PostgreSQL строится как UPPER("name"::text) LIKE UPPER(%s),
+# поэтому триграммные индексы построены по тому же выражению.
+TRIGRAM_INDEXES = (
+    ('reviews_title_name_trgm_idx', 'reviews_title'),
+    ('reviews_category_name_trgm_idx', 'reviews_category'),
+    ('reviews_genre_name_trgm_idx', 'reviews_genre'),
+)
+
+SEARCH_INDEX = (
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS reviews_title_search_idx '
+    'ON reviews_title USING gin (to_tsvector(\'russian\'::regconfig, '
+    'COALESCE(name, \'\') || \' \' || COALESCE(description, \'\')))'
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} '
+            'USING gin ((UPPER(name::text)) gin_trgm_ops)'
+        )
+    schema_editor.execute(SEARCH_INDEX)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+    schema_editor.execute(
+        'DROP INDEX CONCURRENTLY IF EXISTS reviews_title_search_idx'
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0002_title_rating_aggregates'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
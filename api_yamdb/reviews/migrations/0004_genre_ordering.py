@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-17 06:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='genre',
+            options={'ordering': ('name', 'id'), 'verbose_name': 'Жанр', 'verbose_name_plural': 'Жанры'},
+        ),
+    ]
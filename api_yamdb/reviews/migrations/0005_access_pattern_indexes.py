@@ -0,0 +1,128 @@
+# Generated by Django 3.2 on 2026-10-17 06:08
+
+from django.contrib.postgres import operations
+from django.db import migrations, models
+from django.db.models import Min
+import django.db.models.deletion
+
+
+class AddIndexConcurrently(operations.AddIndexConcurrently):
+    """
+    CREATE INDEX CONCURRENTLY не блокирует запись в отзывы и комментарии
+    на время построения; на других базах индекс строится обычно.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        return migrations.AddIndex.database_forwards(
+            self, app_label, schema_editor, from_state, to_state
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        return migrations.AddIndex.database_backwards(
+            self, app_label, schema_editor, from_state, to_state
+        )
+
+
+def delete_duplicate_genre_titles(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    keep = GenreTitle.objects.values('title', 'genre').annotate(
+        keep_id=Min('id')
+    ).values('keep_id')
+    GenreTitle.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0004_genre_ordering'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_genre_titles, migrations.RunPython.noop,
+            atomic=True,
+        ),
+        AddIndexConcurrently(
+            model_name='category',
+            index=models.Index(fields=['name'], name='category_name_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date', '-id'], name='comment_review_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='genre',
+            index=models.Index(fields=['name', 'id'], name='genre_name_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genre_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(fields=['name'], name='title_name_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(fields=['category', 'name'], name='title_category_name_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_genre_title'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='pub_date',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Дата добавления'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='review',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='reviews.review'),
+        ),
+        migrations.AlterField(
+            model_name='genretitle',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.genre'),
+        ),
+        migrations.AlterField(
+            model_name='genretitle',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.title'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='pub_date',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Дата добавления'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='reviews.title'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='category',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='titles', to='reviews.category', verbose_name='Категория'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
 from users.models import User
 
 
@@ -16,8 +18,12 @@ class Genre(models.Model):
     )
 
     class Meta:
+        ordering = ('name', 'id')
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
+        indexes = [
+            models.Index(fields=('name', 'id'), name='genre_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -39,11 +45,65 @@ class Category(models.Model):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(fields=('name',), name='category_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    """Работа с хранимыми агрегатами рейтинга произведений."""
+
+    def apply_review_delta(self, count_delta, score_delta):
+        """
+        Инкрементально сдвигает число отзывов и сумму оценок
+        и пересчитывает рейтинг одним UPDATE.
+        """
+        reviews_count = F('reviews_count') + count_delta
+        score_sum = F('score_sum') + score_delta
+        return self.update(
+            reviews_count=reviews_count,
+            score_sum=score_sum,
+            rating=score_sum / NullIf(reviews_count, 0),
+        )
+
+    def _review_aggregates(self):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        count = Subquery(reviews.annotate(count=Count('pk')).values('count'))
+        total = Subquery(reviews.annotate(total=Sum('score')).values('total'))
+        return count, total
+
+    def rebuild_ratings(self):
+        """Пересчитывает агрегаты рейтинга по таблице отзывов."""
+        count, total = self._review_aggregates()
+        return self.update(
+            reviews_count=Coalesce(count, 0),
+            score_sum=Coalesce(total, 0),
+            rating=total / count,
+        )
+
+    def with_stale_ratings(self):
+        """Произведения, у которых агрегаты разошлись с отзывами."""
+        count, total = self._review_aggregates()
+        return self.annotate(
+            actual_count=Coalesce(count, 0),
+            actual_sum=Coalesce(total, 0),
+        ).filter(
+            ~Q(reviews_count=F('actual_count'))
+            | ~Q(score_sum=F('actual_sum'))
+            | Q(reviews_count=0, rating__isnull=False)
+            | Q(reviews_count__gt=0, rating__isnull=True)
+            | (
+                Q(reviews_count__gt=0)
+                & ~Q(rating=F('score_sum') / F('reviews_count'))
+            )
+        )
+
+
 class Title(models.Model):
     """Модель для произведений"""
     name = models.CharField(
@@ -61,6 +121,7 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        db_index=False,
         related_name='titles',
         verbose_name='Категория'
     )
@@ -72,10 +133,28 @@ class Title(models.Model):
         null=True,
         default=None
     )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        # Фильтры TitleFilter с сортировкой списка по названию.
+        indexes = [
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+            models.Index(
+                fields=('category', 'name'), name='title_category_name_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -84,13 +163,26 @@ class Title(models.Model):
 class GenreTitle(models.Model):
     genre = models.ForeignKey(
         'Genre',
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
     title = models.ForeignKey(
         'Title',
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'genre'),
+                name='unique_genre_title'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=('genre', 'title'), name='genre_title_idx'),
+        ]
+
     def __str__(self):
         return f'{self.title} {self.genre}'
 
@@ -104,13 +196,13 @@ class Review(models.Model):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name='reviews'
     )
     text = models.TextField()
     pub_date = models.DateTimeField(
         'Дата добавления',
-        auto_now_add=True,
-        db_index=True
+        auto_now_add=True
     )
     score = models.PositiveSmallIntegerField(
         validators=(
@@ -126,6 +218,25 @@ class Review(models.Model):
                 name='unique_review'
             ),
         ]
+        # Отзывы выбираются по произведению от новых к старым.
+        indexes = [
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating_state()
+        return instance
+
+    def remember_rating_state(self):
+        """Запоминает значения, уже учтенные в рейтинге произведения."""
+        self._rating_state = (
+            self.__dict__.get('title_id'), self.__dict__.get('score')
+        )
 
 
 class Comment(models.Model):
@@ -137,11 +248,20 @@ class Comment(models.Model):
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name='comments'
     )
     text = models.TextField()
     pub_date = models.DateTimeField(
         'Дата добавления',
-        auto_now_add=True,
-        db_index=True
+        auto_now_add=True
     )
+
+    class Meta:
+        # Комментарии выбираются по отзыву от новых к старым.
+        indexes = [
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
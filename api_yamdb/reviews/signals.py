@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review, Title
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    """Учитывает новый или измененный отзыв в рейтинге произведения."""
+    old_title_id, old_score = getattr(
+        instance, '_rating_state', (None, None)
+    )
+    if created:
+        Title.objects.filter(pk=instance.title_id).apply_review_delta(
+            1, instance.score
+        )
+    elif old_title_id is None:
+        Title.objects.filter(pk=instance.title_id).rebuild_ratings()
+    elif old_title_id != instance.title_id:
+        Title.objects.filter(pk=old_title_id).apply_review_delta(
+            -1, -old_score
+        )
+        Title.objects.filter(pk=instance.title_id).apply_review_delta(
+            1, instance.score
+        )
+    elif old_score != instance.score:
+        Title.objects.filter(pk=instance.title_id).apply_review_delta(
+            0, instance.score - old_score
+        )
+    instance.remember_rating_state()
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Исключает удаленный отзыв из рейтинга произведения."""
+    title_id, score = getattr(
+        instance, '_rating_state', (instance.title_id, instance.score)
+    )
+    Title.objects.filter(pk=title_id).apply_review_delta(-1, -score)
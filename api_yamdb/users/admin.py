@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
@@ -15,3 +15,16 @@ class AdminUser(admin.ModelAdmin):
         'confirmation_code',
         'password',
     )
+
+
+@admin.register(OutgoingEmail)
+class AdminOutgoingEmail(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'created',
+        'attempts',
+        'sent_at',
+    )
+    list_filter = ('sent_at',)
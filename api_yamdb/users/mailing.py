@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """Ставит письма в очередь вместо отправки во время запроса."""
+    return OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(
+            subject=subject,
+            body=message,
+            from_email=from_email,
+            recipient=recipient,
+        )
+        for recipient in recipient_list
+    )
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед повторной отправкой."""
+    return timedelta(seconds=min(
+        settings.MAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+        settings.MAIL_RETRY_MAX_DELAY,
+    ))
+
+
+def dispatch_pending(batch_size=100, max_attempts=5):
+    """
+    Отправляет пачку писем через одно SMTP-соединение.
+    Неудачные письма откладываются с нарастающей задержкой.
+    Возвращает количество отправленных и отложенных писем.
+    """
+    sent = failed = 0
+    with transaction.atomic():
+        messages = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                sent_at__isnull=True,
+                attempts__lt=max_attempts,
+                send_after__lte=timezone.now(),
+            ).order_by('send_after')[:batch_size]
+        )
+        if not messages:
+            return sent, failed
+        with get_connection() as connection:
+            for message in messages:
+                try:
+                    EmailMessage(
+                        message.subject,
+                        message.body,
+                        message.from_email,
+                        [message.recipient],
+                        connection=connection,
+                    ).send()
+                except Exception as error:
+                    message.attempts += 1
+                    message.last_error = str(error)
+                    message.send_after = (
+                        timezone.now() + retry_delay(message.attempts)
+                    )
+                    failed += 1
+                else:
+                    message.attempts += 1
+                    message.sent_at = timezone.now()
+                    sent += 1
+        OutgoingEmail.objects.bulk_update(
+            messages, ('attempts', 'last_error', 'send_after', 'sent_at')
+        )
+    return sent, failed
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-17 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Версия токенов'),
+        ),
+    ]
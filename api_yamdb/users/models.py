@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -38,6 +39,10 @@ class User(AbstractUser):
         blank=True,
         null=True
     )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        default=0
+    )
 
     USERNAME_FIELD = 'username'
 
@@ -51,3 +56,82 @@ class User(AbstractUser):
 
     def __str__(self) -> str:
         return self.username
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._token_claims = instance.token_claims()
+        return instance
+
+    def token_claims(self):
+        """Поля пользователя, которые передаются в токене доступа."""
+        return (
+            self.__dict__.get('role'),
+            self.__dict__.get('is_superuser'),
+            self.__dict__.get('is_active'),
+        )
+
+    def save(self, *args, **kwargs):
+        """Смена роли или блокировка отзывает выданные токены."""
+        loaded_claims = getattr(self, '_token_claims', None)
+        if loaded_claims is not None and loaded_claims != self.token_claims():
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._token_claims = self.token_claims()
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+    subject = models.CharField(
+        'Тема',
+        max_length=255
+    )
+    body = models.TextField(
+        'Текст'
+    )
+    from_email = models.EmailField(
+        'Отправитель',
+        max_length=254
+    )
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=254
+    )
+    created = models.DateTimeField(
+        'Дата добавления',
+        auto_now_add=True
+    )
+    send_after = models.DateTimeField(
+        'Отправить не раньше',
+        default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток отправки',
+        default=0
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True
+    )
+    sent_at = models.DateTimeField(
+        'Дата отправки',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['send_after'],
+                condition=models.Q(sent_at__isnull=True),
+                name='outgoing_email_pending_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,398 @@
+"""
+Замер всех маршрутов api/v1 на синтетическом каталоге:
+
+    python -m benchmarks.api [--scale small] [--requests 50]
+                             [--save results.json] [--tolerance 0.5]
+
+Каталог генерируется и загружается через import_csv во временную
+тестовую базу, запросы идут через тестовый клиент. Для каждого
+маршрута считаются p50, p99, пропускная способность и число запросов
+к базе, результаты сравниваются с benchmarks/baseline.json: рост p50
+больше допуска или лишний запрос к базе завершают прогон с кодом 1.
+
+С --server URL замеряются только GET-маршруты уже запущенного
+сервера на базе из переменных DB_*; число запросов к базе берется
+из заголовка Server-Timing.
+"""
+import argparse
+import gc
+import http.client
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+
+from .common import BASE_DIR, test_database
+from .dataset import seed_through_importer
+
+BASELINE = os.path.join(BASE_DIR, 'benchmarks', 'baseline.json')
+
+Route = namedtuple('Route', ('method', 'path', 'data'))
+
+ROUTES = (
+    Route('GET', '/api/v1/titles/', None),
+    Route('GET', '/api/v1/titles/?year={year}', None),
+    Route('GET', '/api/v1/titles/?genre={genre}', None),
+    Route('POST', '/api/v1/titles/', {
+        'name': 'Бенчмарк', 'year': 2000, 'description': 'Описание',
+        'category': '{category}', 'genre': ['{genre}'],
+    }),
+    Route('POST', '/api/v1/titles/bulk/', [{
+        'name': 'Бенчмарк', 'year': 2000, 'description': 'Описание',
+        'category': '{category}', 'genre': ['{genre}'],
+    }]),
+    Route('GET', '/api/v1/titles/{title_id}/', None),
+    Route('PATCH', '/api/v1/titles/{title_id}/', {'name': 'Новое'}),
+    Route('DELETE', '/api/v1/titles/{title_id}/', None),
+    Route('GET', '/api/v1/categories/', None),
+    Route('POST', '/api/v1/categories/', {
+        'name': 'Бенчмарк', 'slug': 'bench-category',
+    }),
+    Route('POST', '/api/v1/categories/bulk/', [{
+        'name': 'Бенчмарк', 'slug': 'bench-category',
+    }]),
+    Route('DELETE', '/api/v1/categories/{category}/', None),
+    Route('DELETE', '/api/v1/categories/bench_category/', None),
+    Route('GET', '/api/v1/genres/', None),
+    Route('POST', '/api/v1/genres/', {
+        'name': 'Бенчмарк', 'slug': 'bench-genre',
+    }),
+    Route('POST', '/api/v1/genres/bulk/', [{
+        'name': 'Бенчмарк', 'slug': 'bench-genre',
+    }]),
+    Route('DELETE', '/api/v1/genres/{genre}/', None),
+    Route('DELETE', '/api/v1/genres/bench_genre/', None),
+    Route('GET', '/api/v1/users/', None),
+    Route('POST', '/api/v1/users/', {
+        'username': 'bench-new', 'email': 'bench-new@yamdb.fake',
+    }),
+    Route('GET', '/api/v1/users/me/', None),
+    Route('PATCH', '/api/v1/users/me/', {'bio': 'Бенчмарк'}),
+    Route('GET', '/api/v1/users/{username}/', None),
+    Route('PATCH', '/api/v1/users/{username}/', {'bio': 'Бенчмарк'}),
+    Route('DELETE', '/api/v1/users/{username}/', None),
+    Route('GET', '/api/v1/titles/{title_id}/reviews/', None),
+    Route(
+        'GET', '/api/v1/titles/{title_id}/reviews/?pagination=cursor', None
+    ),
+    Route('POST', '/api/v1/titles/{title_id}/reviews/', {
+        'text': 'Бенчмарк', 'score': 7,
+    }),
+    Route('GET', '/api/v1/titles/{title_id}/reviews/{review_id}/', None),
+    Route('PATCH', '/api/v1/titles/{title_id}/reviews/{review_id}/', {
+        'score': 5,
+    }),
+    Route('DELETE', '/api/v1/titles/{title_id}/reviews/{review_id}/', None),
+    Route('GET', '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+          None),
+    Route('POST', '/api/v1/titles/{title_id}/reviews/{review_id}/comments/', {
+        'text': 'Бенчмарк',
+    }),
+    Route(
+        'GET',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/',
+        None
+    ),
+    Route(
+        'PATCH',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/',
+        {'text': 'Бенчмарк'}
+    ),
+    Route(
+        'DELETE',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/',
+        None
+    ),
+    Route('POST', '/api/v1/auth/signup/', {
+        'username': 'bench-signup', 'email': 'bench-signup@yamdb.fake',
+    }),
+    Route('POST', '/api/v1/auth/token/', {
+        'username': 'bench-admin', 'confirmation_code': 'bench-code',
+    }),
+)
+
+SERVER_TIMING_QUERIES = re.compile(r'queries: (\d+)')
+
+WARMUP_REQUESTS = 3
+
+
+def format_data(data, params):
+    if isinstance(data, str):
+        return data.format(**params)
+    if isinstance(data, list):
+        return [format_data(item, params) for item in data]
+    if isinstance(data, dict):
+        return {
+            key: format_data(value, params) for key, value in data.items()
+        }
+    return data
+
+
+def route_name(route):
+    return f'{route.method} {route.path}'
+
+
+def api_route_names():
+    """Имена всех маршрутов api/v1, кроме корня роутера."""
+    from api.v1 import urls
+
+    names = set()
+    for pattern in urls.urlpatterns:
+        for url in getattr(pattern, 'url_patterns', [pattern]):
+            names.add(url.name)
+    return names - {None, 'api-root'}
+
+
+def prepare():
+    """Пользователь-администратор, объекты для удаления и параметры URL."""
+    from api.management.commands.explain_queries import sample_params
+    from api.v1.authentication import get_access_token
+    from reviews.models import Category, Comment, Genre
+    from users.models import User
+
+    params = sample_params()
+    if params is None:
+        raise SystemExit('Нет данных: загрузите каталог')
+    admin, _ = User.objects.update_or_create(
+        username='bench-admin', defaults={
+            'email': 'bench-admin@yamdb.fake', 'role': 'admin',
+            'confirmation_code': 'bench-code',
+        }
+    )
+    # Слаги без дефиса попадают в отдельные маршруты удаления.
+    Category.objects.get_or_create(
+        slug='bench_category', defaults={'name': 'Бенчмарк'}
+    )
+    Genre.objects.get_or_create(
+        slug='bench_genre', defaults={'name': 'Бенчмарк'}
+    )
+    comment = Comment.objects.filter(review_id=params['review_id']).first()
+    params.update(
+        comment_id=comment.id if comment else 0,
+        username=User.objects.exclude(pk=admin.pk).values_list(
+            'username', flat=True
+        ).first(),
+    )
+    return params, str(get_access_token(admin))
+
+
+class TestClientDriver:
+    """Запросы тестовым клиентом; записи откатываются после замера."""
+
+    def __init__(self, token):
+        from rest_framework.test import APIClient
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def request(self, method, path, data):
+        from django.db import connection, transaction
+        from django.test.utils import CaptureQueriesContext
+
+        with transaction.atomic() if method != 'GET' else nullcontext():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.generic(
+                    method, path,
+                    json.dumps(data) if data is not None else '',
+                    content_type='application/json',
+                )
+            if method != 'GET':
+                transaction.set_rollback(True)
+        return response.status_code, len(queries), response.resolver_match
+
+
+class ServerDriver:
+    """Запросы к запущенному серверу по HTTP."""
+
+    def __init__(self, url, token):
+        parts = urlsplit(url)
+        self.connection = http.client.HTTPConnection(
+            parts.hostname, parts.port
+        )
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def request(self, method, path, data):
+        self.connection.request(method, path, headers=self.headers)
+        response = self.connection.getresponse()
+        response.read()
+        match = SERVER_TIMING_QUERIES.search(
+            response.getheader('Server-Timing', '')
+        )
+        return response.status, int(match.group(1)) if match else None, None
+
+
+def measure_route(driver, method, path, data, requests):
+    latencies, query_counts, statuses = [], [], set()
+    started = time.perf_counter()
+    for _ in range(requests):
+        call_started = time.perf_counter()
+        status, queries, _ = driver.request(method, path, data)
+        latencies.append((time.perf_counter() - call_started) * 1000)
+        query_counts.append(queries)
+        statuses.add(status)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'p50': round(latencies[len(latencies) // 2], 3),
+        'p99': round(latencies[min(
+            len(latencies) - 1, int(len(latencies) * 0.99)
+        )], 3),
+        'rps': round(requests / elapsed, 1),
+        'queries': max(query_counts) if None not in query_counts else None,
+        'status': sorted(statuses),
+    }
+
+
+def run(driver, params, requests, safe_only=False):
+    results = {}
+    covered = set()
+    for route in ROUTES:
+        if safe_only and route.method != 'GET':
+            continue
+        path = route.path.format(**params)
+        data = format_data(route.data, params)
+        # Первые запросы прогревают кэши и определяют маршрут.
+        for _ in range(WARMUP_REQUESTS):
+            _, _, match = driver.request(route.method, path, data)
+        if match is not None:
+            covered.add(match.url_name)
+        gc.collect()
+        results[route_name(route)] = measure_route(
+            driver, route.method, path, data, requests
+        )
+    return results, covered
+
+
+def compare(results, baseline, tolerance, min_delta=1.0):
+    """
+    Маршруты, у которых p50 или число запросов хуже базовых.
+    Разница p50 меньше min_delta мс считается шумом.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['p50'] > max(
+            base['p50'] * (1 + tolerance), base['p50'] + min_delta
+        ):
+            regressions.append(
+                f'{name}: p50 {result["p50"]:.2f} мс '
+                f'против {base["p50"]:.2f} мс'
+            )
+        if None not in (result['queries'], base['queries']) and (
+            result['queries'] > base['queries']
+        ):
+            regressions.append(
+                f'{name}: запросов к базе {result["queries"]} '
+                f'против {base["queries"]}'
+            )
+    return regressions
+
+
+def report(results, baseline):
+    width = max(len(name) for name in results)
+    print(
+        f'{"маршрут":<{width}} {"p50":>8} {"p99":>8} {"оп/с":>8} '
+        f'{"SQL":>4} {"статус":>7}'
+    )
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = (
+            f'  x{result["p50"] / base["p50"]:.2f}'
+            if base and base['p50'] else ''
+        )
+        queries = '' if result['queries'] is None else result['queries']
+        status = ','.join(map(str, result['status']))
+        print(
+            f'{name:<{width}} {result["p50"]:8.2f} {result["p99"]:8.2f} '
+            f'{result["rps"]:8.1f} {queries:>4} {status:>7}{change}'
+        )
+
+
+def load_baseline(path, scale, vendor):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as baseline_file:
+        stored = json.load(baseline_file)
+    if (stored.get('scale'), stored.get('vendor')) != (scale, vendor):
+        print(
+            f'Базовые результаты сняты на {stored.get("scale")}/'
+            f'{stored.get("vendor")}, сравнение пропущено'
+        )
+        return {}
+    return stored['routes']
+
+
+def main():
+    import django
+
+    django.setup()
+    from api.management.generator import SCALES
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', help='Куда записать результаты в JSON')
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--min-delta', type=float, default=1.0)
+    parser.add_argument('--server', help='URL запущенного сервера')
+    options = parser.parse_args()
+
+    if options.server:
+        from django.db import connection
+
+        params, token = prepare()
+        results, covered = run(
+            ServerDriver(options.server, token), params, options.requests,
+            safe_only=True,
+        )
+    else:
+        with tempfile.TemporaryDirectory() as tmp, test_database():
+            from django.db import connection
+
+            started = time.monotonic()
+            seed_through_importer(tmp, options.scale, options.seed)
+            print(
+                f'Каталог {options.scale} загружен за '
+                f'{time.monotonic() - started:.1f} с'
+            )
+            params, token = prepare()
+            results, covered = run(
+                TestClientDriver(token), params, options.requests
+            )
+            uncovered = api_route_names() - covered
+            if uncovered:
+                print(f'Не покрыты маршруты: {", ".join(sorted(uncovered))}')
+
+    baseline = load_baseline(
+        options.baseline, options.scale, connection.vendor
+    )
+    report(results, baseline)
+    if options.save:
+        with open(options.save, 'w', encoding='utf-8') as result_file:
+            json.dump({
+                'scale': options.scale, 'vendor': connection.vendor,
+                'routes': results,
+            }, result_file, ensure_ascii=False, indent=2)
+    regressions = compare(
+        results, baseline, options.tolerance, options.min_delta
+    )
+    if regressions:
+        print('Регрессии:')
+        for regression in regressions:
+            print(f'  {regression}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
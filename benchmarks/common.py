@@ -0,0 +1,123 @@
+"""
+Общая обвязка бенчмарков: настройка Django, временная тестовая база
+и замер пропускной способности.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+@contextmanager
+def test_database(sqlite_path=None):
+    """
+    Поднимает Django и создает тестовую базу на время замера.
+    sqlite_path нужен, если базу SQLite читают другие процессы.
+    """
+    import django
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    django.setup()
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    if sqlite_path and connection.vendor == 'sqlite':
+        connection.settings_dict['TEST']['NAME'] = sqlite_path
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed_catalog(titles=100, genres=10, reviews=50, comments=50):
+    """Каталог произведений с отзывами и комментариями к первому из них."""
+    from reviews.models import Category, Comment, Genre, Review, Title
+    from users.models import User
+
+    categories = [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(genres)
+    ]
+    genre_objs = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(genres)
+    ]
+    authors = [
+        User.objects.create(username=f'author-{i}', email=f'a{i}@yamdb.fake')
+        for i in range(max(reviews, comments))
+    ]
+    title_objs = []
+    for i in range(titles):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=1900 + i % 120,
+            description=f'Описание {i}', category=categories[i % genres],
+        )
+        title.genre.set(genre_objs[i % genres:i % genres + 3])
+        title_objs.append(title)
+    review_objs = [
+        Review.objects.create(
+            title=title_objs[0], author=author, text=f'Отзыв {i}',
+            score=i % 10 + 1,
+        )
+        for i, author in enumerate(authors[:reviews])
+    ]
+    for i, author in enumerate(authors[:comments]):
+        Comment.objects.create(
+            review=review_objs[0], author=author, text=f'Комментарий {i}'
+        )
+    admin = User.objects.create(
+        username='bench-admin', email='bench@yamdb.fake', role='admin'
+    )
+    return {'titles': title_objs, 'reviews': review_objs, 'admin': admin}
+
+
+def measure(func, seconds=2.0):
+    """Количество вызовов func в секунду за отведенное время."""
+    func()
+    calls = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - started
+    return calls / elapsed
+
+
+def measure_latency(func, requests=200):
+    """Задержки отдельных вызовов func в миллисекундах по возрастанию."""
+    func()
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return sorted(latencies)
+
+
+def report_latency(name, results):
+    """Печатает медиану, 95-й перцентиль и среднее по вариантам."""
+    print(name)
+    for label, latencies in results.items():
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        mean = sum(latencies) / len(latencies)
+        print(
+            f'  {label:<12} p50 {p50:7.2f} мс  p95 {p95:7.2f} мс  '
+            f'среднее {mean:7.2f} мс'
+        )
+
+
+def report(name, rates):
+    """Печатает пропускную способность вариантов относительно первого."""
+    base = next(iter(rates.values()))
+    print(name)
+    for label, rate in rates.items():
+        print(f'  {label:<12} {rate:10.1f} оп/с  x{rate / base:.2f}')
@@ -0,0 +1,60 @@
+"""
+Задержка запроса к API с новым соединением с БД на каждый запрос
+(CONN_MAX_AGE=0) и с переиспользованием соединения: без проверки,
+с SELECT 1 на каждый запрос и с проверкой только после простоя
+DB_HEALTH_CHECK_IDLE_SECONDS:
+
+    python -m benchmarks.connections [--requests 200]
+
+Разница заметна на PostgreSQL; переменные DB_* те же, что у проекта.
+"""
+import argparse
+
+from .common import (measure_latency, report_latency, seed_catalog,
+                     test_database)
+
+
+def request_cycle(client, url):
+    """Запрос с сигналами начала и конца, как под gunicorn."""
+    from django.core.signals import request_finished, request_started
+
+    def call():
+        # Тестовый клиент отключает close_old_connections на время
+        # запроса, поэтому сигналы жизненного цикла шлем сами.
+        request_started.send(sender=None)
+        client.get(url)
+        request_finished.send(sender=None)
+    return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    options = parser.parse_args()
+    with test_database():
+        from django.conf import settings
+        from django.db import connection
+        from rest_framework.test import APIClient
+
+        data = seed_catalog(titles=20)
+        client = APIClient()
+        client.force_authenticate(user=data['admin'])
+        url = f'/api/v1/titles/{data["titles"][0].id}/'
+        results = {}
+        for label, max_age, idle_seconds in (
+            ('new', 0, None),
+            ('reuse', None, None),
+            ('reuse+check', None, 0),
+            ('idle-check', None, 30),
+        ):
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+            settings.DB_HEALTH_CHECK_IDLE_SECONDS = idle_seconds
+            results[label] = measure_latency(
+                request_cycle(client, url), options.requests
+            )
+        report_latency(f'GET {url}', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+"""
+Загрузка синтетического каталога штатным импортером: generate_data
+пишет csv-файлы, import_csv загружает их так же, как боевые данные.
+"""
+
+
+def seed_through_importer(path, scale, seed=0, workers=None):
+    """Генерирует каталог масштаба scale и загружает его import_csv."""
+    from django.core.management import call_command
+
+    call_command(
+        'generate_data', scale=scale, seed=seed, output='csv', path=path,
+        verbosity=0,
+    )
+    options = {'path': path, 'verbosity': 0}
+    if workers:
+        options['workers'] = workers
+    call_command('import_csv', **options)
@@ -0,0 +1,50 @@
+"""
+Сравнение рендеринга JSON стандартным json и orjson
+на ответах списков произведений и отзывов:
+
+    python -m benchmarks.renderers [--seconds 2] [--page-size 100]
+"""
+import argparse
+
+from .common import measure, report, seed_catalog, test_database
+
+
+def payloads(data, page_size):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user=data['admin'])
+    title_id = data['titles'][0].id
+    for url in ('/api/v1/titles/', f'/api/v1/titles/{title_id}/reviews/'):
+        url = f'{url}?page_size={page_size}'
+        yield url, client.get(url).data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--page-size', type=int, default=100)
+    options = parser.parse_args()
+    with test_database():
+        from api.v1.renderers import ORJSONRenderer, orjson
+        from rest_framework.renderers import JSONRenderer
+
+        if orjson is None:
+            print('orjson не установлен, сравнение бессмысленно')
+            return
+        data = seed_catalog(
+            titles=options.page_size, reviews=options.page_size
+        )
+        for url, payload in payloads(data, options.page_size):
+            report(f'Рендеринг {url}', {
+                'json': measure(
+                    lambda: JSONRenderer().render(payload), options.seconds
+                ),
+                'orjson': measure(
+                    lambda: ORJSONRenderer().render(payload), options.seconds
+                ),
+            })
+
+
+if __name__ == '__main__':
+    main()
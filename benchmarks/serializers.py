@@ -0,0 +1,65 @@
+"""
+Сравнение пропускной способности списков на ModelSerializer
+и на ValuesSerializer из строк .values():
+
+    python -m benchmarks.serializers [--seconds 2] [--page-size 100]
+"""
+import argparse
+
+from .common import measure, report, seed_catalog, test_database
+
+LIST_URLS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+)
+
+
+def compare_serializers(data, seconds):
+    from api.v1.fast_serializers import get_values_serializer
+    from api.v1.serializers import TitleSerializer
+    from api.v1.views import TitleViewSet
+
+    queryset = TitleViewSet.queryset.all()
+    fast = get_values_serializer(TitleSerializer)
+    report('Сериализация всех произведений', {
+        'serializer': measure(
+            lambda: TitleSerializer(queryset.all(), many=True).data, seconds
+        ),
+        'values': measure(
+            lambda: fast.serialize(fast.values(queryset.all())), seconds
+        ),
+    })
+
+
+def compare_endpoints(data, seconds, page_size):
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user=data['admin'])
+    for url in LIST_URLS:
+        url = url.format(
+            title_id=data['titles'][0].id, review_id=data['reviews'][0].id
+        )
+        url = f'{url}?page_size={page_size}'
+        rates = {}
+        for label, enabled in (('serializer', False), ('values', True)):
+            with override_settings(API_FAST_READ_SERIALIZERS=enabled):
+                rates[label] = measure(lambda: client.get(url), seconds)
+        report(f'GET {url}', rates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--page-size', type=int, default=100)
+    options = parser.parse_args()
+    with test_database():
+        data = seed_catalog(titles=options.page_size)
+        compare_serializers(data, options.seconds)
+        compare_endpoints(data, options.seconds, options.page_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Нагрузка на gunicorn с синхронными воркерами (WSGI) и с воркерами
+uvicorn (ASGI, API_ASYNC_VIEWS) при растущем числе одновременных
+клиентов:
+
+    python -m benchmarks.servers [--workers 2] [--concurrency 1,10,50,100]
+
+Сервер запускается отдельным процессом на той же тестовой базе;
+переменные DB_* те же, что у проекта. Нужны gunicorn и uvicorn.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import tempfile
+import time
+
+from .common import BASE_DIR, seed_catalog, test_database
+
+SERVERS = {
+    'wsgi': ['api_yamdb.wsgi:application'],
+    'asgi': [
+        'api_yamdb.asgi:application',
+        '--worker-class', 'uvicorn.workers.UvicornWorker',
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, workers, env):
+    # Воркерам нужен общий кэш: версии данных и токены хранятся в нем.
+    env = dict(env)
+    env.setdefault('CACHE_BACKEND', 'file')
+    env.setdefault('CACHE_LOCATION', tempfile.mkdtemp(prefix='yamdb_cache_'))
+    process = subprocess.Popen(
+        [
+            'gunicorn', *SERVERS[mode],
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+        ],
+        # Из каталога проекта gunicorn подхватывает gunicorn.conf.py.
+        cwd=os.path.join(BASE_DIR, 'api_yamdb'), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'Сервер {mode} не запустился')
+
+
+async def fetch(port, request):
+    """Один запрос на новом соединении: статус ответа."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def load(port, request, concurrency, seconds=None, requests=None):
+    """
+    concurrency клиентов шлют запросы подряд в течение seconds
+    или пока не будет отправлено requests запросов.
+    """
+    latencies = []
+    errors = 0
+    sent = 0
+    deadline = time.monotonic() + seconds if seconds else None
+
+    def finished():
+        if deadline is not None and time.monotonic() >= deadline:
+            return True
+        return requests is not None and sent >= requests
+
+    async def client():
+        nonlocal errors, sent
+        while not finished():
+            sent += 1
+            started = time.perf_counter()
+            try:
+                code = await fetch(port, request)
+            except OSError:
+                code = None
+            if code is None or code >= 500:
+                errors += 1
+            else:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.monotonic()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return sorted(latencies), errors, time.monotonic() - started
+
+
+def http_request(method, path, body=b''):
+    head = (
+        f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+        'Connection: close\r\nContent-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n\r\n'
+    )
+    return head.encode() + body
+
+
+def report(name, results):
+    print(name)
+    for (mode, concurrency), (latencies, errors, elapsed) in results.items():
+        if not latencies:
+            print(f'  {mode} c={concurrency:<4} нет успешных ответов')
+            continue
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(
+            f'  {mode} c={concurrency:<4} {len(latencies) / elapsed:8.1f} '
+            f'запр/с  p50 {p50:8.2f} мс  p95 {p95:8.2f} мс  '
+            f'ошибок {errors}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', default='1,10,50,100')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    options = parser.parse_args()
+    levels = [int(level) for level in options.concurrency.split(',')]
+    with tempfile.TemporaryDirectory() as tmp, test_database(
+        sqlite_path=os.path.join(tmp, 'bench.sqlite3')
+    ):
+        from django.db import connection
+        from users.models import User
+
+        seed_catalog(titles=200)
+        User.objects.create(
+            username='bench-user', email='user@yamdb.fake',
+            confirmation_code='code',
+        )
+        connection.close()
+        env = dict(os.environ, DB_NAME=connection.settings_dict['NAME'])
+        endpoints = {
+            'GET /api/v1/titles/': http_request('GET', '/api/v1/titles/'),
+            'POST /api/v1/auth/token/': http_request(
+                'POST', '/api/v1/auth/token/',
+                b'{"username": "bench-user", "confirmation_code": "code"}'
+            ),
+        }
+        results = {name: {} for name in endpoints}
+        for mode in SERVERS:
+            port = free_port()
+            server = start_server(mode, port, options.workers, env)
+            try:
+                for name, request in endpoints.items():
+                    for concurrency in levels:
+                        results[name][mode, concurrency] = asyncio.run(load(
+                            port, request, concurrency, options.seconds
+                        ))
+            finally:
+                server.terminate()
+                server.wait()
+        for name, rows in results.items():
+            report(name, dict(sorted(rows.items(), key=lambda row: (
+                row[0][1], row[0][0]
+            ))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Память воркеров gunicorn с gunicorn.conf.py при старте и после
+нагрузки, без предзагрузки приложения и с ней:
+
+    python -m benchmarks.workers [--workers 4] [--requests 2000]
+
+PSS делит общие страницы между процессами, поэтому сумма PSS воркеров
+показывает выигрыш от copy-on-write. Нужен Linux с /proc.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from .common import seed_catalog, test_database
+from .servers import free_port, http_request, load, start_server
+
+
+def workers_memory(master, workers):
+    from api_yamdb.workers import child_pids, memory_usage
+
+    deadline = time.monotonic() + 30
+    while len(child_pids(master)) < workers:
+        if time.monotonic() > deadline:
+            raise RuntimeError('Воркеры не запустились')
+        time.sleep(0.1)
+    # Воркеры прогреваются после fork, если приложение не предзагружено.
+    time.sleep(1)
+    usages = [memory_usage(pid) for pid in child_pids(master)]
+    return [usage for usage in usages if usage]
+
+
+def report(name, usages):
+    count = len(usages)
+    average = {
+        key: sum(usage[key] for usage in usages) / count / 1024
+        for key in usages[0]
+    }
+    total_pss = sum(usage['Pss'] for usage in usages) / 1024
+    print(
+        f'  {name:<20} rss {average["Rss"]:6.1f} МБ  '
+        f'pss {average["Pss"]:6.1f} МБ  private {average["Private"]:6.1f} МБ'
+        f'  сумма pss {total_pss:7.1f} МБ'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=2000)
+    options = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp, test_database(
+        sqlite_path=os.path.join(tmp, 'bench.sqlite3')
+    ):
+        from django.db import connection
+
+        data = seed_catalog(titles=200)
+        connection.close()
+        paths = [
+            '/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/',
+            f'/api/v1/titles/{data["titles"][0].id}/reviews/',
+        ]
+        for preload in ('False', 'True'):
+            env = dict(
+                os.environ, DB_NAME=connection.settings_dict['NAME'],
+                GUNICORN_PRELOAD=preload, GUNICORN_MAX_REQUESTS='0',
+            )
+            port = free_port()
+            server = start_server('wsgi', port, options.workers, env)
+            try:
+                print(
+                    f'GUNICORN_PRELOAD={preload}, '
+                    f'воркеров {options.workers}'
+                )
+                report('при старте', workers_memory(
+                    server.pid, options.workers
+                ))
+                per_path = options.requests // len(paths)
+                for path in paths:
+                    asyncio.run(load(
+                        port, http_request('GET', path), 8, requests=per_path
+                    ))
+                report('после нагрузки', workers_memory(
+                    server.pid, options.workers
+                ))
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
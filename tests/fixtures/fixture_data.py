@@ -0,0 +1,81 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create(
+        username='TestAdmin', email='testadmin@yamdb.fake', role='admin'
+    )
+
+
+@pytest.fixture
+def admin_client(admin):
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.fixture
+def clear_cache():
+    """
+    LocMemCache общий для тестов процесса: версии и COUNT(*)
+    предыдущего теста не должны влиять на число запросов.
+    """
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(6)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(6)
+    ]
+    authors = [
+        django_user_model.objects.create(
+            username=f'author-{i}', email=f'a{i}@yamdb.fake'
+        )
+        for i in range(6)
+    ]
+    titles = []
+    for i in range(6):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000 + i, description='',
+            category=categories[i],
+        )
+        title.genre.set(genres[i:i + 2])
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=5
+        )
+        for author in authors
+    ]
+    for author in authors:
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий'
+        )
+    return {'titles': titles, 'reviews': reviews}
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """
+    Реплика для тестов маршрутизации: отдельное соединение с той же
+    тестовой базой, чтобы чтение с неверного алиаса было заметно.
+    """
+    from django.conf import settings
+
+    settings.DATABASES['replica'] = {
+        **settings.DATABASES['default'], 'TEST': {'MIRROR': 'default'},
+    }
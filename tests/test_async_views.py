@@ -0,0 +1,93 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def async_client(settings):
+    settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+    cache.clear()
+    client = AsyncClient()
+    return lambda method, *args, **kwargs: async_to_sync(
+        getattr(client, method)
+    )(*args, **kwargs)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncViews:
+
+    def test_signup_and_token(self, async_client, django_user_model):
+        data = {'username': 'async-user', 'email': 'async@yamdb.fake'}
+        response = async_client(
+            'post', '/api/v1/auth/signup/', data,
+            content_type='application/json'
+        )
+        assert response.status_code == 200
+        assert response.json() == data
+        sync = APIClient().post('/api/v1/auth/signup/', data, format='json')
+        response = async_client(
+            'post', '/api/v1/auth/signup/', data,
+            content_type='application/json'
+        )
+        assert response.content == sync.content, (
+            'Проверьте, что асинхронный signup отвечает как синхронный'
+        )
+
+        user = django_user_model.objects.get(username='async-user')
+        user.confirmation_code = 'code'
+        user.save()
+        response = async_client('post', '/api/v1/auth/token/', {
+            'username': 'async-user', 'confirmation_code': 'code'
+        }, content_type='application/json')
+        assert response.status_code == 201
+        assert response.json()['access']
+
+    def test_errors_match_sync_views(self, async_client):
+        for url, data in (
+            ('/api/v1/auth/signup/', {'username': 'me'}),
+            ('/api/v1/auth/token/', {'username': 'nobody',
+                                     'confirmation_code': 'x'}),
+        ):
+            expected = APIClient().post(url, data, format='json')
+            response = async_client(
+                'post', url, data, content_type='application/json'
+            )
+            assert response.status_code == expected.status_code
+            assert response.json() == expected.json()
+        response = async_client('get', '/api/v1/auth/token/')
+        assert response.status_code == 405
+
+    def test_cached_list_without_thread(self, async_client, catalog,
+                                        django_assert_num_queries):
+        first = async_client('get', '/api/v1/titles/')
+        assert first.status_code == 200
+        with django_assert_num_queries(0):
+            second = async_client('get', '/api/v1/titles/')
+        assert second.content == first.content
+        assert second['ETag'] == first['ETag']
+        assert second['Allow'] == first['Allow']
+        # AsyncClient в Django 3.2 передает extra как заголовки ASGI.
+        response = async_client(
+            'get', '/api/v1/titles/', **{'If-None-Match': first['ETag']}
+        )
+        assert response.status_code == 304
+        sync = APIClient().get('/api/v1/titles/')
+        assert sync.content == first.content
+
+    def test_unpaginated_lists(self, async_client, admin_client, admin,
+                               catalog):
+        from api.v1.authentication import get_access_token
+
+        token = get_access_token(admin)
+        for url in ('/api/v1/titles/', '/api/v1/genres/'):
+            response = async_client(
+                'get', f'{url}?pagination=none',
+                **{'Authorization': f'Bearer {token}'}
+            )
+            assert response.status_code == 200
+            expected = admin_client.get(url, {'page_size': 100})
+            assert response.json() == expected.json()['results'], (
+                'Проверьте, что список без пагинации работает под ASGI'
+            )
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def get_client(user):
+    user.confirmation_code = 'code'
+    user.save()
+    response = APIClient().post('/api/v1/auth/token/', {
+        'username': user.username, 'confirmation_code': 'code'
+    })
+    assert response.status_code == 201
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.json()["access"]}')
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('clear_cache')
+class TestStatelessJWT:
+
+    def test_authenticated_request_skips_user_query(self, admin):
+        client = get_client(admin)
+        client.get('/api/v1/users/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/users/')
+        assert response.status_code == 200
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "users_user" WHERE' in query['sql']
+        ], 'Проверьте, что пользователь не загружается из БД на каждый запрос'
+
+    def test_role_change_revokes_token(
+        self, admin, django_capture_on_commit_callbacks
+    ):
+        from api.v1.authentication import TOKEN_STATE_KEY
+        from django.core.cache import cache
+
+        client = get_client(admin)
+        assert client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        with django_capture_on_commit_callbacks() as callbacks:
+            admin.save()
+        assert cache.get(TOKEN_STATE_KEY.format(admin.pk)) is not None, (
+            'Проверьте, что состояние токенов сбрасывается только после '
+            'фиксации транзакции'
+        )
+        for callback in callbacks:
+            callback()
+        assert client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что смена роли отзывает выданные токены'
+        )
+
+    def test_token_user_can_write(self, admin, catalog):
+        client = get_client(admin)
+        title = catalog['titles'][2]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = client.post(url, {'text': 'Хорошо', 'score': 8})
+        assert response.status_code == 201
+        assert response.json()['author'] == admin.username
+        review_url = f'{url}{response.json()["id"]}/'
+        response = client.patch(review_url, {'score': 6})
+        assert response.status_code == 200
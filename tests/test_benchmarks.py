@@ -0,0 +1,29 @@
+from django.urls import resolve
+
+from benchmarks.api import ROUTES, api_route_names, compare
+
+PARAMS = {
+    'title_id': 1, 'review_id': 2, 'comment_id': 3, 'year': 2000,
+    'category': 'category-1', 'genre': 'genre-1', 'username': 'user1',
+}
+
+
+class TestApiBenchmark:
+
+    def test_every_route_measured(self):
+        covered = {
+            resolve(route.path.format(**PARAMS).split('?')[0]).url_name
+            for route in ROUTES
+        }
+        assert api_route_names() <= covered, (
+            'Проверьте, что бенчмарк обходит все маршруты api/v1'
+        )
+
+    def test_regressions(self):
+        baseline = {'GET /': {'p50': 10.0, 'queries': 2}}
+        assert not compare(
+            {'GET /': {'p50': 10.5, 'queries': 2}}, baseline, 0.25
+        )
+        assert len(compare(
+            {'GET /': {'p50': 20.0, 'queries': 3}}, baseline, 0.25
+        )) == 2
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+
+def bulk_json(response):
+    return json.loads(b''.join(response.streaming_content))
+
+
+@pytest.mark.django_db
+class TestBulkWrite:
+
+    def test_bulk_create_titles(self, admin_client, catalog,
+                                django_assert_max_num_queries):
+        from reviews.models import GenreTitle, Title
+
+        payload = [
+            {'name': f'Новинка {i}', 'year': 2020, 'description': 'Описание',
+             'category': 'category-1', 'genre': ['genre-1', 'genre-2']}
+            for i in range(20)
+        ]
+        with django_assert_max_num_queries(30):
+            response = admin_client.post(
+                '/api/v1/titles/bulk/', payload, format='json'
+            )
+        assert response.status_code == 201
+        results = bulk_json(response)
+        assert [item['status'] for item in results] == [201] * 20
+        assert results[0]['data']['genre'] == ['genre-1', 'genre-2']
+        assert results[0]['data']['category'] == 'category-1'
+        assert Title.objects.filter(name__startswith='Новинка').count() == 20
+        assert GenreTitle.objects.filter(
+            title__name__startswith='Новинка'
+        ).count() == 40, 'Проверьте, что связи с жанрами записаны'
+
+    def test_invalid_item_rolls_back_batch(self, admin_client, catalog):
+        from reviews.models import Title
+
+        payload = [
+            {'name': 'Годное', 'year': 2020, 'description': 'Описание',
+             'category': 'category-1', 'genre': ['genre-1']},
+            {'name': 'Без жанра', 'year': 2020, 'description': 'Описание',
+             'category': 'category-1', 'genre': ['unknown']},
+        ]
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', payload, format='json'
+        )
+        assert response.status_code == 400
+        results = bulk_json(response)
+        assert [item['status'] for item in results] == [424, 400]
+        assert 'genre' in results[1]['errors']
+        assert not Title.objects.filter(name='Годное').exists(), (
+            'Проверьте, что по умолчанию список пишется целиком или никак'
+        )
+
+        response = admin_client.post(
+            '/api/v1/titles/bulk/?transaction=item', payload, format='json'
+        )
+        assert response.status_code == 207
+        assert [item['status'] for item in bulk_json(response)] == [201, 400]
+        assert Title.objects.filter(name='Годное').exists()
+
+    def test_bulk_update_titles(self, admin_client, catalog):
+        titles = catalog['titles']
+        payload = [
+            {'id': titles[0].id, 'name': 'Переименовано',
+             'genre': ['genre-5']},
+            {'id': titles[1].id, 'year': 1990},
+            {'id': 0, 'year': 1990},
+        ]
+        response = admin_client.patch(
+            '/api/v1/titles/bulk/', payload, format='json'
+        )
+        assert [item['status'] for item in bulk_json(response)] == [
+            424, 424, 404
+        ]
+        response = admin_client.patch(
+            '/api/v1/titles/bulk/?transaction=item', payload, format='json'
+        )
+        assert response.status_code == 207
+        results = bulk_json(response)
+        assert [item['status'] for item in results] == [200, 200, 404]
+        assert results[0]['data']['name'] == 'Переименовано'
+        assert results[0]['data']['genre'] == ['genre-5']
+        assert results[1]['data']['year'] == 1990
+        titles[0].refresh_from_db()
+        assert list(titles[0].genre.values_list('slug', flat=True)) == [
+            'genre-5'
+        ]
+
+    def test_bulk_genres_and_categories(self, admin_client, catalog):
+        from reviews.models import Genre
+
+        response = admin_client.post('/api/v1/genres/bulk/', [
+            {'name': 'Новый', 'slug': 'new'},
+            {'name': 'Дубль', 'slug': 'new'},
+            {'name': 'Занятый', 'slug': 'genre-0'},
+        ], format='json')
+        assert [item['status'] for item in bulk_json(response)] == [
+            424, 400, 400
+        ], 'Проверьте проверку уникальности слагов внутри списка и в базе'
+
+        response = admin_client.patch('/api/v1/genres/bulk/', [
+            {'slug': 'genre-0', 'name': 'Обновлен'},
+        ], format='json')
+        assert response.status_code == 200
+        assert Genre.objects.get(slug='genre-0').name == 'Обновлен'
+
+        response = admin_client.delete(
+            '/api/v1/categories/bulk/', ['category-0', 'missing'],
+            format='json'
+        )
+        assert bulk_json(response) == [
+            {'slug': 'category-0', 'status': 204},
+            {'slug': 'missing', 'status': 404,
+             'errors': {'detail': 'Объект не найден.'}},
+        ]
+        catalog['titles'][0].refresh_from_db()
+        assert catalog['titles'][0].category is None
+
+    def test_bulk_requires_admin(self, catalog):
+        response = APIClient().post(
+            '/api/v1/genres/bulk/', [{'name': 'Жанр', 'slug': 'x'}],
+            format='json'
+        )
+        assert response.status_code == 401
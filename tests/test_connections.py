@@ -0,0 +1,47 @@
+import time
+
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionHealthChecks:
+
+    @pytest.mark.parametrize('idle_seconds,idle,usable,checked,closed', (
+        (30, 60, False, True, True),
+        (30, 60, True, True, False),
+        (30, 5, False, False, False),
+        (None, 60, False, False, False),
+    ))
+    def test_idle_unusable_connection_is_closed(
+        self, monkeypatch, settings, idle_seconds, idle, usable, checked,
+        closed
+    ):
+        checks, calls = [], []
+        connection.ensure_connection()
+        settings.DB_HEALTH_CHECK_IDLE_SECONDS = idle_seconds
+        monkeypatch.setattr(
+            connection, 'idle_since', time.monotonic() - idle, raising=False
+        )
+
+        def is_usable():
+            checks.append(1)
+            return usable
+        monkeypatch.setattr(connection, 'is_usable', is_usable)
+        monkeypatch.setattr(connection, 'close', lambda: calls.append(1))
+        request_started.send(sender=None)
+        assert bool(checks) == checked, (
+            'Проверьте, что SELECT 1 выполняется только для соединений, '
+            'простоявших дольше DB_HEALTH_CHECK_IDLE_SECONDS'
+        )
+        assert bool(calls) == closed, (
+            'Проверьте, что в начале запроса закрываются только '
+            'неработающие соединения'
+        )
+
+    def test_request_end_marks_idle_start(self, monkeypatch):
+        connection.ensure_connection()
+        monkeypatch.delattr(connection, 'idle_since', raising=False)
+        request_finished.send(sender=None)
+        assert time.monotonic() - connection.idle_since < 1
@@ -0,0 +1,31 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestExplainQueries:
+
+    def test_api_queries_use_indexes(self, admin, catalog, capsys):
+        call_command('explain_queries', '--fail-on-seqscan')
+        output = capsys.readouterr().out
+        assert 'запросов с полным проходом: 0' in output, (
+            'Проверьте, что запросы эндпоинтов API используют индексы'
+        )
+
+    def test_anonymous_cache_bypassed(self, catalog, capsys):
+        from api.management.commands.explain_queries import (ENDPOINTS,
+                                                             sample_params)
+        from django.core.management.base import CommandError
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        params = sample_params()
+        for url in ENDPOINTS:
+            client.get(url.format(**params))
+        call_command('explain_queries')
+        output = capsys.readouterr().out
+        assert f'Проверено эндпоинтов: {len(ENDPOINTS) - 1} из' in output, (
+            'Проверьте, что кэш ответов не скрывает запросы от EXPLAIN'
+        )
+        with pytest.raises(CommandError, match='/api/v1/users/'):
+            call_command('explain_queries', '--fail-on-seqscan')
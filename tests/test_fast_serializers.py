@@ -0,0 +1,41 @@
+import pytest
+
+FAST_LIST_URLS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?page_size=100',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/titles/{title_id}/reviews/?pagination=cursor',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    '?review_format=id',
+)
+
+
+@pytest.mark.django_db
+class TestFastListSerializers:
+
+    @pytest.mark.parametrize('url', FAST_LIST_URLS)
+    def test_fast_list_matches_serializer(self, admin_client, catalog,
+                                          settings, url):
+        from reviews.models import Title
+
+        Title.objects.create(name='Без категории', year=1999)
+        url = url.format(
+            title_id=catalog['titles'][0].id,
+            review_id=catalog['reviews'][0].id,
+        )
+        settings.API_FAST_READ_SERIALIZERS = False
+        expected = admin_client.get(url)
+        settings.API_FAST_READ_SERIALIZERS = True
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert response.content == expected.content, (
+            f'Проверьте, что быстрый список `{url}` совпадает '
+            'с ответом сериализатора байт в байт'
+        )
+
+    def test_fast_titles_query_count(self, admin_client, catalog, settings,
+                                     django_assert_max_num_queries):
+        settings.API_FAST_READ_SERIALIZERS = True
+        with django_assert_max_num_queries(3):
+            admin_client.get('/api/v1/titles/?page_size=100')
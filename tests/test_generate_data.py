@@ -0,0 +1,128 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from reviews.models import Comment, Review, Title
+
+SCALE = {'users': 5, 'categories': 2, 'genres': 3, 'titles': 4,
+         'reviews': 30, 'comments': 40}
+
+
+def generate_csv(path, seed=1, **counts):
+    call_command(
+        'generate_data', output='csv', path=str(path), seed=seed,
+        verbosity=0, **{**SCALE, **counts}
+    )
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8') as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+class TestGenerateCsv:
+
+    def test_deterministic_by_seed(self, tmp_path):
+        for name, seed in (('a', 1), ('b', 1), ('c', 2)):
+            generate_csv(tmp_path / name, seed=seed)
+        for filename in ('titles.csv', 'review.csv', 'comments.csv'):
+            assert (tmp_path / 'a' / filename).read_bytes() == (
+                tmp_path / 'b' / filename
+            ).read_bytes(), 'Проверьте, что данные зависят только от seed'
+        assert (tmp_path / 'a' / 'review.csv').read_bytes() != (
+            tmp_path / 'c' / 'review.csv'
+        ).read_bytes(), 'Проверьте, что seed меняет данные'
+
+    def test_reviews_unique_and_skewed(self, tmp_path):
+        generate_csv(tmp_path, users=50, titles=100, reviews=1000)
+        rows = read_rows(tmp_path / 'review.csv')
+        assert len(rows) == 1000
+        assert len({(row['title_id'], row['author_id']) for row in rows}) == (
+            1000
+        ), 'Проверьте, что автор оставляет один отзыв на произведение'
+        per_title = sorted((
+            sum(row['title_id'] == str(title) for row in rows)
+            for title in range(1, 101)
+        ), reverse=True)
+        assert per_title[0] == 50, (
+            'Проверьте, что у популярного произведения отзыв от каждого '
+            'пользователя'
+        )
+        assert per_title[50] < 10, (
+            'Проверьте, что отзывы распределены неравномерно'
+        )
+
+    def test_reviews_capped_by_users(self, tmp_path):
+        generate_csv(tmp_path)
+        assert len(read_rows(tmp_path / 'review.csv')) == 20, (
+            'Отзывов не больше, чем пар произведение-автор'
+        )
+
+    def test_descriptions_skewed(self, tmp_path):
+        from statistics import median
+
+        generate_csv(tmp_path, titles=2000)
+        lengths = [
+            len(row['description'].split())
+            for row in read_rows(tmp_path / 'titles.csv')
+        ]
+        empty = lengths.count(0)
+        assert 100 < empty < 300, (
+            'Проверьте, что у части произведений нет описания'
+        )
+        filled = [length for length in lengths if length]
+        assert 30 <= median(filled) <= 50
+        assert max(filled) > 4 * median(filled), (
+            'Проверьте, что длина описаний распределена с длинным хвостом'
+        )
+
+    def test_silent_with_verbosity_0(self, tmp_path):
+        from io import StringIO
+
+        out = StringIO()
+        call_command(
+            'generate_data', output='csv', path=str(tmp_path), verbosity=0,
+            stdout=out, **SCALE
+        )
+        assert out.getvalue() == '', (
+            'Проверьте, что с -v0 команда ничего не выводит'
+        )
+
+    def test_csv_path_required(self):
+        with pytest.raises(CommandError):
+            call_command('generate_data', output='csv', verbosity=0)
+
+
+@pytest.mark.django_db
+class TestGenerateDb:
+
+    def test_loads_catalog_with_ratings(self):
+        call_command('generate_data', verbosity=0, seed=1, **SCALE)
+        assert Review.objects.count() == 20
+        assert Comment.objects.count() == 40
+        assert not Title.objects.with_stale_ratings().exists(), (
+            'Проверьте, что рейтинги пересчитаны после генерации'
+        )
+
+    def test_matches_import_csv(self, tmp_path):
+        generate_csv(tmp_path)
+        call_command('import_csv', path=str(tmp_path), verbosity=0)
+        imported = list(Comment.objects.values_list(
+            'id', 'review_id', 'author_id', 'text'
+        ).order_by('id'))
+        assert len(imported) == 40
+        assert [
+            (int(row['id']), int(row['review_id']), int(row['author_id']),
+             row['text'])
+            for row in read_rows(tmp_path / 'comments.csv')
+        ] == imported, 'Проверьте, что csv совместимы с import_csv'
+        assert [
+            row['description'] for row in read_rows(tmp_path / 'titles.csv')
+        ] == list(Title.objects.order_by('id').values_list(
+            'description', flat=True
+        )), 'Проверьте, что описания произведений загружаются'
+
+    def test_refuses_non_empty_tables(self, admin):
+        with pytest.raises(CommandError):
+            call_command('generate_data', verbosity=0, **SCALE)
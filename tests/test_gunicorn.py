@@ -0,0 +1,87 @@
+import os
+import runpy
+
+from django.conf import settings
+
+CONFIG = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+
+
+class TestGunicornConfig:
+
+    def test_workers_from_cpu_count(self, monkeypatch):
+        monkeypatch.setattr(os, 'sched_getaffinity', lambda pid: {0, 1})
+        config = runpy.run_path(CONFIG)
+        assert config['workers'] == 5
+        assert config['threads'] == 1
+        assert config['preload_app'] is True
+        assert 0 < config['max_requests_jitter'] < config['max_requests']
+
+        monkeypatch.setenv('WORKER_CLASS', 'gthread')
+        config = runpy.run_path(CONFIG)
+        assert (config['workers'], config['threads']) == (3, 4)
+
+        monkeypatch.setenv('WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+        monkeypatch.setenv('GUNICORN_WORKERS', '7')
+        config = runpy.run_path(CONFIG)
+        assert config['workers'] == 7, (
+            'Проверьте, что GUNICORN_WORKERS переопределяет расчет по ядрам'
+        )
+
+    def test_workers_capped(self, monkeypatch):
+        monkeypatch.setattr(
+            os, 'sched_getaffinity', lambda pid: set(range(32))
+        )
+        monkeypatch.setenv('GUNICORN_MAX_WORKERS', '10')
+        assert runpy.run_path(CONFIG)['workers'] == 10
+
+
+class TestDockerfile:
+
+    def test_config_in_workdir(self):
+        with open(os.path.join(settings.BASE_DIR, 'Dockerfile')) as file:
+            workdirs = [
+                line.split()[1] for line in file
+                if line.startswith('WORKDIR')
+            ]
+        # Контекст сборки — корень репозитория, он копируется в /app.
+        workdir = os.path.join(
+            os.path.dirname(settings.BASE_DIR),
+            os.path.relpath(workdirs[-1], '/app'),
+        )
+        assert os.path.isfile(os.path.join(workdir, 'gunicorn.conf.py')), (
+            'Проверьте, что gunicorn.conf.py лежит в WORKDIR образа'
+        )
+        assert os.path.isfile(os.path.join(workdir, 'manage.py'))
+
+
+class TestWarmUp:
+
+    def test_warm_up_without_queries(self):
+        from api.v1.fast_serializers import get_values_serializer
+
+        from api_yamdb.workers import warm_up
+
+        get_values_serializer.cache_clear()
+        # Без django_db любой запрос к базе завершится ошибкой.
+        warm_up()
+        assert get_values_serializer.cache_info().currsize > 0
+
+
+class TestSharedCache:
+
+    def test_local_cache_refused_for_many_workers(self, settings):
+        from api_yamdb.workers import shared_cache_error
+
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        assert shared_cache_error(1) is None
+        assert shared_cache_error(3), (
+            'Проверьте, что несколько воркеров не запускаются '
+            'с локальным кэшем'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': 'redis://redis:6379/0',
+        }}
+        assert shared_cache_error(3) is None
@@ -0,0 +1,281 @@
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+from api.management import loader
+from api.management.commands import import_csv
+from api.management.loader import (CSV_TABLES, deferred_constraints,
+                                   table_dependencies)
+from django.core.management.base import CommandError
+from django.db import DatabaseError, IntegrityError
+
+Span = namedtuple('Span', ('model', 'started', 'finished'))
+
+
+def fake_load_table(index, path, loader_options, progress=None):
+    """Загрузка-заглушка для процессов пула: отдает время работы."""
+    started = time.monotonic()
+    time.sleep(0.2)
+    if path == 'fail':
+        raise CommandError('Ошибка загрузки')
+    return Span(CSV_TABLES[index].model, started, time.monotonic())
+
+
+def load(method, jobs, **kwargs):
+    command = import_csv.Command()
+    spans = []
+    command.report_table = spans.append
+    getattr(command, method)(
+        jobs, table_dependencies(CSV_TABLES), {}, **kwargs
+    )
+    return {span.model: span for span in spans}
+
+
+class TestLoadOrder:
+
+    def test_dependencies_follow_foreign_keys(self):
+        from reviews.models import (Category, Comment, Genre, GenreTitle,
+                                    Review, Title)
+        from users.models import User
+
+        assert table_dependencies(CSV_TABLES) == {
+            User: set(),
+            Category: set(),
+            Genre: set(),
+            Title: {Category},
+            GenreTitle: {Title, Genre},
+            Review: {Title, User},
+            Comment: {Review, User},
+        }
+
+    @pytest.mark.parametrize('method, kwargs', (
+        ('load_sequential', {}),
+        ('load_parallel', {'workers': 3}),
+    ))
+    def test_tables_after_dependencies(self, monkeypatch, method, kwargs):
+        monkeypatch.setattr(import_csv, 'load_table', fake_load_table)
+        spans = load(
+            method, {index: 'ok' for index in range(len(CSV_TABLES))},
+            **kwargs
+        )
+        assert set(spans) == {table.model for table in CSV_TABLES}
+        for model, related in table_dependencies(CSV_TABLES).items():
+            for dependency in related:
+                assert spans[dependency].finished <= spans[model].started, (
+                    f'Проверьте, что {model.__name__} загружается после '
+                    f'{dependency.__name__}'
+                )
+
+    def test_independent_tables_run_in_parallel(self, monkeypatch):
+        monkeypatch.setattr(import_csv, 'load_table', fake_load_table)
+        spans = load(
+            'load_parallel', {index: 'ok' for index in range(3)}, workers=3
+        )
+        assert max(span.started for span in spans.values()) < min(
+            span.finished for span in spans.values()
+        ), 'Проверьте, что независимые таблицы загружаются одновременно'
+
+    def test_failed_table_stops_dependents(self, monkeypatch):
+        from reviews.models import Title
+
+        monkeypatch.setattr(import_csv, 'load_table', fake_load_table)
+        jobs = {
+            index: 'fail' if table.model is Title else 'ok'
+            for index, table in enumerate(CSV_TABLES)
+        }
+        command = import_csv.Command()
+        spans = []
+        command.report_table = spans.append
+        with pytest.raises(CommandError):
+            command.load_parallel(
+                jobs, table_dependencies(CSV_TABLES), {}, workers=3
+            )
+        loaded = {span.model.__name__ for span in spans}
+        assert not loaded & {'GenreTitle', 'Review', 'Comment'}, (
+            'Проверьте, что таблицы со ссылкой на упавшую не загружаются'
+        )
+
+
+class FakeCursor:
+    """Курсор PostgreSQL: отдает найденные ограничения и пишет SQL."""
+
+    def __init__(self, fail):
+        self.fail = fail
+        self.executed = []
+        self.results = [
+            [
+                ('reviews_review', 'review_title_fk',
+                 'FOREIGN KEY (title_id)'),
+                ('reviews_review', 'review_author_fk',
+                 'FOREIGN KEY (author_id)'),
+            ],
+            [('review_pub_date_idx', 'CREATE INDEX review_pub_date_idx')],
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+        if self.fail and self.fail in sql:
+            raise DatabaseError('violates foreign key constraint')
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+    def copy_expert(self, sql, file):
+        from django.db import connection
+
+        self.executed.append(sql)
+        if self.fail and self.fail in sql:
+            # Исключение драйвера, как у psycopg2 при повторе ключа.
+            raise connection.Database.IntegrityError('duplicate key value')
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    from django.db import connection
+
+    def connect(fail=None):
+        cursor = FakeCursor(fail)
+        monkeypatch.setattr(loader, 'connection', SimpleNamespace(
+            vendor='postgresql', cursor=lambda: cursor,
+            ops=connection.ops,
+            wrap_database_errors=connection.wrap_database_errors,
+        ))
+        return cursor
+    return connect
+
+
+class TestDeferredConstraints:
+
+    def test_restored_after_failed_load(self, postgres):
+        from reviews.models import Review
+
+        cursor = postgres()
+        with pytest.raises(CommandError):
+            with deferred_constraints([Review]):
+                raise CommandError('Ошибка загрузки')
+        assert cursor.executed[-5:] == [
+            'CREATE INDEX review_pub_date_idx',
+            'ALTER TABLE reviews_review ADD CONSTRAINT "review_title_fk" '
+            'FOREIGN KEY (title_id) NOT VALID',
+            'ALTER TABLE reviews_review VALIDATE CONSTRAINT '
+            '"review_title_fk"',
+            'ALTER TABLE reviews_review ADD CONSTRAINT "review_author_fk" '
+            'FOREIGN KEY (author_id) NOT VALID',
+            'ALTER TABLE reviews_review VALIDATE CONSTRAINT '
+            '"review_author_fk"',
+        ], 'Проверьте, что ограничения восстанавливаются после ошибки'
+
+    def test_dangling_reference_reported(self, postgres):
+        from reviews.models import Review
+
+        cursor = postgres(fail='VALIDATE CONSTRAINT "review_title_fk"')
+        with pytest.raises(IntegrityError, match='review_title_fk'):
+            with deferred_constraints([Review]):
+                pass
+        assert cursor.executed[-1] == (
+            'ALTER TABLE reviews_review VALIDATE CONSTRAINT '
+            '"review_author_fk"'
+        ), 'Проверьте, что ошибка одного ключа не мешает остальным'
+
+
+@pytest.mark.django_db
+class TestCopy:
+
+    def test_duplicate_reported_as_integrity_error(self, postgres,
+                                                   tmp_path):
+        from reviews.models import Category
+
+        postgres(fail='COPY "reviews_category"')
+        write_csv(tmp_path, 'category.csv', [(1, 'Категория', 'category')])
+        table = next(table for table in CSV_TABLES if table.model is Category)
+        with pytest.raises(CommandError, match='category.csv'):
+            import_csv.load_table(
+                CSV_TABLES.index(table), str(tmp_path / 'category.csv'),
+                {'method': 'copy', 'on_conflict': 'fail'}
+            )
+
+
+def write_csv(path, filename, rows):
+    with open(path / filename, 'w', encoding='utf-8') as csv_file:
+        csv_file.write('\n'.join(','.join(map(str, row)) for row in rows))
+
+
+def import_csv_command(path, **options):
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    out = StringIO()
+    call_command('import_csv', path=str(path), stdout=out, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportCsv:
+
+    @pytest.fixture
+    def categories(self, tmp_path):
+        write_csv(tmp_path, 'category.csv', [('id', 'name', 'slug')] + [
+            (pk, f'Категория {pk}', f'category-{pk}') for pk in range(1, 6)
+        ])
+        return tmp_path
+
+    def test_rows_written_in_batches(self, categories):
+        from reviews.models import Category
+
+        output = import_csv_command(categories, batch_size=2, verbosity=2)
+        assert [
+            line.split(': ')[1].split(',')[0]
+            for line in output.splitlines()
+            if line.startswith('  reviews_category')
+        ] == ['2 строк', '4 строк', '5 строк'], (
+            'Проверьте, что строки записываются пачками по --batch-size'
+        )
+        assert Category.objects.count() == 5
+
+    def test_on_conflict(self, categories):
+        from reviews.models import Category
+
+        import_csv_command(categories)
+        Category.objects.filter(pk=1).update(name='Изменена')
+        import_csv_command(categories, on_conflict='skip')
+        assert Category.objects.count() == 5
+        assert Category.objects.get(pk=1).name == 'Изменена', (
+            'Проверьте, что --on-conflict skip не перезаписывает строки'
+        )
+        with pytest.raises(CommandError, match='category.csv'):
+            import_csv_command(categories, on_conflict='fail')
+
+    def test_resume_after_failure(self, categories):
+        from reviews.models import Category, Title
+
+        header = ('id', 'name', 'year', 'category_id')
+        write_csv(categories, 'titles.csv', [
+            header, (1, 'Первое', 2000, 1), (1, 'Повтор', 2001, 2),
+        ])
+        with pytest.raises(CommandError, match='titles.csv'):
+            import_csv_command(categories, on_conflict='fail')
+        assert Category.objects.count() == 5
+        assert not Title.objects.exists(), (
+            'Проверьте, что таблица с ошибкой откатывается целиком'
+        )
+
+        write_csv(categories, 'titles.csv', [
+            header, (1, 'Первое', 2000, 1), (2, 'Второе', 2001, 2),
+        ])
+        output = import_csv_command(
+            categories, on_conflict='fail', resume=True
+        )
+        assert 'reviews_category: обработано 0, пропущено 5' in output, (
+            'Проверьте, что --resume пропускает уже загруженные строки'
+        )
+        assert list(Title.objects.values_list('name', flat=True)) == [
+            'Первое', 'Второе'
+        ]
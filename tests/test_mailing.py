@@ -0,0 +1,45 @@
+from unittest import mock
+
+import pytest
+from django.core import mail
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestMailOutbox:
+
+    def test_signup_enqueues_and_dispatcher_sends(self):
+        from users.mailing import dispatch_pending
+        from users.models import OutgoingEmail
+
+        response = APIClient().post('/api/v1/auth/signup/', {
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'
+        })
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо синхронно'
+        )
+        assert OutgoingEmail.objects.filter(
+            recipient='newbie@yamdb.fake', sent_at__isnull=True
+        ).exists()
+
+        assert dispatch_pending() == (1, 0)
+        assert [message.to for message in mail.outbox] == [
+            ['newbie@yamdb.fake']
+        ]
+        assert dispatch_pending() == (0, 0)
+
+    def test_failed_message_is_postponed(self):
+        from users.mailing import dispatch_pending, enqueue_mail
+        from users.models import OutgoingEmail
+
+        enqueue_mail('Тема', 'Текст', 'a@b.c', ['d@e.f'])
+        with mock.patch(
+            'django.core.mail.EmailMessage.send', side_effect=OSError('down')
+        ):
+            assert dispatch_pending() == (0, 1)
+        message = OutgoingEmail.objects.get(recipient='d@e.f')
+        assert message.attempts == 1 and message.last_error == 'down'
+        assert dispatch_pending() == (0, 0), (
+            'Проверьте, что письмо повторяется только после задержки'
+        )
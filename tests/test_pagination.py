@@ -0,0 +1,89 @@
+import pytest
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('clear_cache')
+class TestPagination:
+
+    def test_reviews_cursor_pagination(self, admin_client, catalog):
+        url = f'/api/v1/titles/{catalog["titles"][0].id}/reviews/'
+        response = admin_client.get(url, {'pagination': 'cursor'})
+        data = response.json()
+        assert response.status_code == 200
+        assert 'count' not in data, (
+            'Проверьте, что курсорная пагинация не считает COUNT(*)'
+        )
+        assert data['next'] and data['previous'] is None
+        ids = [review['id'] for review in data['results']]
+
+        response = admin_client.get(data['next'])
+        ids += [review['id'] for review in response.json()['results']]
+        expected = sorted(
+            (review.id for review in catalog['reviews']), reverse=True
+        )
+        assert ids == expected, (
+            'Проверьте, что курсор обходит отзывы от новых к старым '
+            'без пропусков и повторов'
+        )
+
+    def test_page_size_is_bounded(self, admin_client, catalog):
+        from django.conf import settings
+        from reviews.models import Genre
+
+        cap = settings.API_MAX_PAGE_SIZE
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр сверх предела {i}', slug=f'over-cap-{i}')
+            for i in range(cap)
+        )
+        response = admin_client.get('/api/v1/genres/', {'page_size': 5})
+        assert len(response.json()['results']) == 5
+        response = admin_client.get('/api/v1/genres/', {'page_size': 10**6})
+        data = response.json()
+        assert data['count'] > cap
+        assert len(data['results']) == cap, (
+            'Проверьте, что page_size ограничен API_MAX_PAGE_SIZE'
+        )
+
+    def test_count_is_cached_until_write(
+        self, admin_client, catalog, django_assert_num_queries,
+        django_capture_on_commit_callbacks
+    ):
+        from reviews.models import Genre
+
+        admin_client.get('/api/v1/genres/')
+        with django_assert_num_queries(1):
+            response = admin_client.get('/api/v1/genres/')
+        assert response.json()['count'] == 6
+        assert response.json()['count_exact'] is True
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Genre.objects.create(name='Новый', slug='new')
+        response = admin_client.get('/api/v1/genres/')
+        assert response.json()['count'] == 7, (
+            'Проверьте, что запись в таблицу сбрасывает кэш COUNT(*)'
+        )
+
+    def test_estimate_is_cached(self, admin_client, catalog, monkeypatch,
+                                django_assert_num_queries):
+        from api.v1.pagination import CachedCountPagination
+
+        estimates = []
+
+        def estimate_count(paginator, queryset):
+            estimates.append(queryset.model)
+            return 10**6
+
+        monkeypatch.setattr(
+            CachedCountPagination, 'estimate_count', estimate_count
+        )
+        for _ in range(2):
+            with django_assert_num_queries(1):
+                response = admin_client.get('/api/v1/genres/')
+            assert response.json()['count'] == 10**6
+            assert response.json()['count_exact'] is False
+        assert len(estimates) == 1, (
+            'Проверьте, что оценка числа строк берется из кэша'
+        )
+        response = admin_client.get('/api/v1/genres/', {'search': 'Жанр'})
+        assert response.json()['count'] == 6
+        assert response.json()['count_exact'] is True
@@ -0,0 +1,142 @@
+import os
+import re
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+SERVER_TIMING = re.compile(
+    r'db;desc="queries: (\d+)";dur=[\d.]+, serialize;dur=([\d.]+), '
+    r'render;dur=([\d.]+), total;dur=([\d.]+)'
+)
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+
+    def test_stages_in_header(self, catalog, settings):
+        settings.API_SERVER_TIMING = True
+        cache.clear()
+        response = APIClient().get('/api/v1/titles/')
+        match = SERVER_TIMING.fullmatch(response['Server-Timing'])
+        assert match, 'Проверьте заголовок Server-Timing'
+        queries, serialize, render, total = match.groups()
+        assert int(queries) > 0
+        assert float(serialize) > 0 and float(render) > 0
+        assert float(total) >= float(serialize) + float(render)
+
+        response = APIClient().get('/api/v1/titles/')
+        queries = SERVER_TIMING.fullmatch(response['Server-Timing']).group(1)
+        assert queries == '0', 'Ответ из кэша не должен обращаться к базе'
+
+    def test_header_disabled_by_default(self, catalog):
+        assert 'Server-Timing' not in APIClient().get('/api/v1/genres/'), (
+            'Проверьте, что Server-Timing отдается только по настройке'
+        )
+
+
+class InterleavedCache:
+    """Кэш, уступающий поток перед каждым обращением, как сеть."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __getattr__(self, name):
+        method = getattr(self.cache, name)
+
+        def call(*args, **kwargs):
+            time.sleep(0.001)
+            return method(*args, **kwargs)
+        return call
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_prometheus_histogram(self, catalog, settings):
+        from api.v1.metrics import REGISTRY
+
+        settings.API_METRICS_TOKEN = 'secret'
+        REGISTRY.flush()
+        cache.clear()
+        client = APIClient()
+        for _ in range(3):
+            client.get('/api/v1/genres/')
+        client.credentials(HTTP_AUTHORIZATION='Bearer secret')
+        text = client.get('/metrics/').content.decode()
+        assert '# TYPE yamdb_request_duration_seconds histogram' in text
+        labels = 'endpoint="genres-list",method="GET"'
+        assert (
+            f'yamdb_request_duration_seconds_bucket{{{labels},status="200",'
+            f'le="+Inf"}} 3'
+        ) in text
+        assert (
+            f'yamdb_request_duration_seconds_count{{{labels},status="200"}} 3'
+        ) in text
+        assert f'yamdb_db_queries_total{{{labels}}}' in text
+        assert 'endpoint="metrics"' not in text
+
+    def test_token(self, settings):
+        client = APIClient()
+        assert client.get('/metrics/').status_code == 404, (
+            'Проверьте, что без токена метрики закрыты'
+        )
+        settings.DEBUG = True
+        assert client.get('/metrics/').status_code == 200
+        settings.DEBUG = False
+        settings.API_METRICS_TOKEN = 'secret'
+        assert client.get('/metrics/').status_code == 403
+        client.credentials(HTTP_AUTHORIZATION='Bearer secret')
+        assert client.get('/metrics/').status_code == 200
+
+    def test_concurrent_flushes_keep_series(self, monkeypatch):
+        from api.v1 import metrics
+        from api.v1.metrics import MetricsRegistry
+        from api.v1.profiling import RequestTimings
+
+        cache.clear()
+        monkeypatch.setattr(metrics, 'cache', InterleavedCache(cache))
+        workers = [MetricsRegistry() for _ in range(6)]
+        for number, registry in enumerate(workers):
+            registry.observe(f'endpoint-{number}', 'GET', 200,
+                             RequestTimings())
+        barrier = threading.Barrier(len(workers))
+
+        def flush(registry):
+            barrier.wait()
+            registry.flush()
+
+        threads = [
+            threading.Thread(target=flush, args=(registry,))
+            for registry in workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        text = MetricsRegistry().export()
+        for number in range(len(workers)):
+            assert (
+                f'yamdb_request_duration_seconds_count{{endpoint="endpoint-'
+                f'{number}",method="GET",status="200"}} 1'
+            ) in text, 'Проверьте, что серии воркеров не теряются'
+
+
+@pytest.mark.django_db
+class TestSlowRequestProfile:
+
+    def test_profile_dumped(self, catalog, settings, tmp_path):
+        settings.API_PROFILE_SAMPLE_RATE = 1
+        settings.API_PROFILE_SLOW_MS = 0
+        settings.API_PROFILE_DIR = str(tmp_path)
+        APIClient().get('/api/v1/categories/')
+        dumps = os.listdir(tmp_path)
+        assert len(dumps) == 1 and 'categories-list' in dumps[0]
+
+        settings.API_PROFILE_SLOW_MS = 60000
+        APIClient().get('/api/v1/categories/')
+        assert len(os.listdir(tmp_path)) == 1, (
+            'Проверьте, что сохраняются только медленные запросы'
+        )
@@ -0,0 +1,55 @@
+import pytest
+from django.db import connection
+
+# Максимальное число SQL-запросов на страницу списка с пустым кэшем.
+LIST_QUERY_BUDGETS = {
+    '/api/v1/titles/': 3,
+    '/api/v1/categories/': 2,
+    '/api/v1/genres/': 2,
+    '/api/v1/users/': 2,
+    '/api/v1/titles/{title_id}/reviews/': 2,
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/': 2,
+}
+
+# Списки с CachedCountPagination: с пустым кэшем PostgreSQL перед
+# COUNT(*) запрашивает оценку числа строк из pg_class.
+ESTIMATED_COUNT_URLS = (
+    '/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/',
+    '/api/v1/users/',
+)
+
+
+def cold_budget(url, budget):
+    if connection.vendor == 'postgresql' and url in ESTIMATED_COUNT_URLS:
+        return budget + 1
+    return budget
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('clear_cache')
+class TestQueryBudget:
+
+    @pytest.mark.parametrize('url,budget', LIST_QUERY_BUDGETS.items())
+    def test_list_query_budget(self, admin_client, catalog, url, budget,
+                               django_assert_max_num_queries):
+        budget = cold_budget(url, budget)
+        url = url.format(
+            title_id=catalog['titles'][0].id,
+            review_id=catalog['reviews'][0].id,
+        )
+        with django_assert_max_num_queries(budget):
+            response = admin_client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+        )
+        assert len(response.json()['results']) > 1, (
+            f'Проверьте, что `{url}` возвращает несколько объектов'
+        )
+
+    def test_titles_query_count_does_not_depend_on_page_size(
+            self, admin_client, catalog, django_assert_max_num_queries):
+        for page_size in (1, 6):
+            with django_assert_max_num_queries(
+                cold_budget('/api/v1/titles/', 3)
+            ):
+                admin_client.get(f'/api/v1/titles/?page_size={page_size}')
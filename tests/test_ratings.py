@@ -0,0 +1,107 @@
+import pytest
+from api.v1.versions import get_version
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+def rating_state(title):
+    title.refresh_from_db()
+    return title.reviews_count, title.score_sum, title.rating
+
+
+@pytest.mark.django_db
+class TestStoredRating:
+
+    def test_review_create_update_delete(self, catalog, django_user_model):
+        from reviews.models import Review
+
+        title = catalog['titles'][1]
+        assert rating_state(title) == (0, 0, None), (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+        authors = django_user_model.objects.all()[:2]
+        first = Review.objects.create(
+            title=title, author=authors[0], text='.', score=9
+        )
+        assert rating_state(title) == (1, 9, 9)
+        Review.objects.create(
+            title=title, author=authors[1], text='.', score=10
+        )
+        assert rating_state(title) == (2, 19, 9), (
+            'Проверьте, что рейтинг округляется вниз, как int(Avg)'
+        )
+
+        first.score = 4
+        first.save()
+        assert rating_state(title) == (2, 14, 7), (
+            'Проверьте, что изменение оценки сдвигает рейтинг'
+        )
+        first.text = 'Без изменения оценки'
+        first.save()
+        assert rating_state(title) == (2, 14, 7)
+
+        first.delete()
+        assert rating_state(title) == (1, 10, 10)
+        Review.objects.filter(title=title).get().delete()
+        assert rating_state(title) == (0, 0, None), (
+            'Проверьте, что без отзывов рейтинг снова пустой'
+        )
+
+    def test_matches_average(self, catalog, django_user_model):
+        from django.db.models import Avg
+        from reviews.models import Review
+
+        title = catalog['titles'][2]
+        for author, score in zip(django_user_model.objects.all(),
+                                 (1, 2, 2, 7, 10)):
+            Review.objects.create(
+                title=title, author=author, text='.', score=score
+            )
+        average = Review.objects.filter(title=title).aggregate(
+            average=Avg('score')
+        )['average']
+        assert rating_state(title)[2] == int(average) == 4
+
+    def test_stale_ratings_found_and_rebuilt(
+        self, catalog, django_capture_on_commit_callbacks
+    ):
+        from reviews.models import Title
+
+        assert not Title.objects.with_stale_ratings().exists()
+        drifted, emptied = catalog['titles'][:2]
+        Title.objects.filter(pk=drifted.pk).update(score_sum=1, rating=0)
+        Title.objects.filter(pk=emptied.pk).update(rating=5)
+        assert set(Title.objects.with_stale_ratings()) == {
+            drifted, emptied
+        }, 'Проверьте поиск произведений с разошедшимися агрегатами'
+
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--verify')
+        version = get_version(Title)
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--verify')
+        assert rating_state(drifted) == (6, 30, 5)
+        assert rating_state(emptied) == (0, 0, None)
+        assert get_version(Title) != version, (
+            'Проверьте, что пересчет сбрасывает кэш ответов о произведениях'
+        )
+
+    def test_title_update_keeps_concurrent_rating(self, catalog):
+        from api.v1.serializers import TitleSerializerCreate
+        from reviews.models import Title
+
+        title = Title.objects.get(pk=catalog['titles'][0].pk)
+        before = rating_state(Title.objects.get(pk=title.pk))
+        # Отзыв, добавленный после того, как админ загрузил произведение.
+        Title.objects.filter(pk=title.pk).apply_review_delta(1, 10)
+        serializer = TitleSerializerCreate(
+            title, data={'name': 'Новое название'}, partial=True
+        )
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+        title.refresh_from_db()
+        assert title.name == 'Новое название'
+        assert (title.reviews_count, title.score_sum) == (
+            before[0] + 1, before[1] + 10
+        ), 'Проверьте, что изменение произведения не затирает агрегаты'
@@ -0,0 +1,78 @@
+import io
+import json
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+PAYLOAD = {
+    'count': 2,
+    'results': [
+        {'id': 1, 'name': 'Произведение\u2028', 'rating': None,
+         'genre': [{'name': 'Жанр', 'slug': 'genre'}], 'year': 2000},
+        {'id': 2, 'name': '"кавычки"\n', 'rating': 7, 'genre': [],
+         'year': -1},
+    ],
+}
+
+
+class TestRenderers:
+
+    def test_orjson_output_matches_json_renderer(self):
+        from api.v1.renderers import ORJSONRenderer
+
+        assert ORJSONRenderer().render(PAYLOAD) == (
+            JSONRenderer().render(PAYLOAD)
+        ), 'Проверьте, что ORJSONRenderer выводит тот же JSON, что и DRF'
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        from api.v1 import renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert renderers.ORJSONRenderer().render(PAYLOAD) == (
+            JSONRenderer().render(PAYLOAD)
+        )
+        stream = io.BytesIO(b'{"username": "\xd0\xaf"}')
+        assert renderers.ORJSONParser().parse(stream) == {'username': 'Я'}
+
+    def test_parser(self):
+        from api.v1.renderers import ORJSONParser
+
+        body = JSONRenderer().render(PAYLOAD)
+        assert ORJSONParser().parse(io.BytesIO(body)) == PAYLOAD
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"username":'))
+
+
+@pytest.mark.django_db
+class TestStreamingList:
+
+    def test_unpaginated_titles_are_streamed(self, admin_client, catalog,
+                                             monkeypatch):
+        from api.v1.views import TitleViewSet
+
+        monkeypatch.setattr(TitleViewSet, 'stream_chunk_size', 4)
+        response = admin_client.get('/api/v1/titles/?pagination=none')
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что список без пагинации отдается потоком'
+        )
+        titles = json.loads(b''.join(response.streaming_content))
+        expected = admin_client.get('/api/v1/titles/?page_size=100')
+        assert titles == expected.json()['results'], (
+            'Проверьте, что поток содержит все произведения по порядку'
+        )
+
+    def test_unpaginated_only_for_admins(self, catalog, django_user_model):
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        response = client.get('/api/v1/genres/?pagination=none')
+        assert response.status_code == 401, (
+            'Проверьте, что аноним не получает всю таблицу одним ответом'
+        )
+        client.force_authenticate(django_user_model.objects.create(
+            username='reader', email='reader@yamdb.fake'
+        ))
+        response = client.get('/api/v1/titles/?pagination=none')
+        assert response.status_code == 403
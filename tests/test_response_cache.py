@@ -0,0 +1,91 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_anonymous_titles_are_cached(self, catalog,
+                                         django_assert_num_queries):
+        client = APIClient()
+        first = client.get('/api/v1/titles/')
+        with django_assert_num_queries(0):
+            second = client.get('/api/v1/titles/')
+        assert second.json() == first.json()
+        assert second['ETag'] == first['ETag']
+
+        response = client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=first['ETag']
+        )
+        assert response.status_code == 304
+        assert not response.content
+
+    def test_review_invalidates_title_rating(
+        self, catalog, django_user_model, django_capture_on_commit_callbacks
+    ):
+        from reviews.models import Review
+
+        client = APIClient()
+        title = catalog['titles'][1]
+        url = f'/api/v1/titles/{title.id}/'
+        first = client.get(url)
+        assert first.json()['rating'] is None
+
+        author = django_user_model.objects.create(
+            username='critic', email='critic@yamdb.fake'
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            Review.objects.create(
+                title=title, author=author, text='.', score=9
+            )
+        response = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения'
+        )
+        assert response.json()['rating'] == 9
+
+    def test_version_bumped_only_after_commit(
+        self, catalog, django_user_model, django_capture_on_commit_callbacks
+    ):
+        from django.db import transaction
+        from reviews.models import Review
+
+        client = APIClient()
+        url = f'/api/v1/titles/{catalog["titles"][1].id}/'
+        etag = client.get(url)['ETag']
+        author = django_user_model.objects.create(
+            username='critic', email='critic@yamdb.fake'
+        )
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                Review.objects.create(
+                    title=catalog['titles'][1], author=author, text='.',
+                    score=9,
+                )
+                assert client.get(url)['ETag'] == etag, (
+                    'Проверьте, что версия данных не меняется до фиксации'
+                )
+                transaction.set_rollback(True)
+        assert not callbacks, (
+            'Проверьте, что откаченная запись не сдвигает версию данных'
+        )
+        assert client.get(url)['ETag'] == etag
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_authenticated_not_modified(self, admin_client, catalog,
+                                        django_assert_num_queries):
+        url = f'/api/v1/titles/{catalog["titles"][0].id}/reviews/'
+        response = admin_client.get(url)
+        assert response['ETag'] and response['Last-Modified']
+        with django_assert_num_queries(0):
+            not_modified = admin_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert not_modified.status_code == 304
+        not_modified = admin_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert not_modified.status_code == 304
@@ -0,0 +1,78 @@
+import warnings
+
+import pytest
+from django.core.paginator import UnorderedObjectListWarning
+
+
+@pytest.mark.django_db
+class TestNestedResources:
+
+    def test_duplicate_review_is_rejected(self, admin_client, catalog):
+        url = f'/api/v1/titles/{catalog["titles"][1].id}/reviews/'
+        response = admin_client.post(url, {'text': 'Первый', 'score': 7})
+        assert response.status_code == 201
+        response = admin_client.post(url, {'text': 'Второй', 'score': 3})
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение запрещен'
+        )
+
+    def test_missing_parent_returns_404(self, admin_client, catalog):
+        assert admin_client.get('/api/v1/titles/0/reviews/').status_code == 404
+        assert admin_client.get(
+            f'/api/v1/titles/{catalog["titles"][1].id}/reviews/'
+        ).status_code == 200
+
+    def test_comments_require_review_of_title(self, admin_client, catalog):
+        review = catalog['reviews'][0]
+        other_title = catalog['titles'][1]
+        url = f'/api/v1/titles/{other_title.id}/reviews/{review.id}/comments/'
+        assert admin_client.get(url).status_code == 404, (
+            'Проверьте, что отзыв должен принадлежать произведению из URL'
+        )
+        response = admin_client.post(url, {'text': 'Комментарий'})
+        assert response.status_code == 404
+
+    def test_comments_with_review_id(self, admin_client, catalog):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        review = catalog['reviews'][0]
+        url = (
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/'
+        )
+        assert admin_client.get(url).json()['results'][0]['review'] == (
+            review.text
+        )
+        counts = []
+        for page_size in (2, 6):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.get(url, {
+                    'review_format': 'id', 'page_size': page_size
+                })
+            results = response.json()['results']
+            assert len(results) == page_size
+            assert {item['review'] for item in results} == {review.id}
+            assert not [
+                query for query in context.captured_queries
+                if '"reviews_review"."text"' in query['sql']
+            ], 'Проверьте, что текст отзыва не загружается из БД'
+            counts.append(len(context.captured_queries))
+        assert counts == [2, 2], (
+            'Проверьте, что число запросов не растет с размером страницы'
+        )
+
+    def test_pages_are_ordered(self, admin_client, catalog):
+        title = catalog['titles'][0]
+        review = catalog['reviews'][0]
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            for url in (
+                f'/api/v1/titles/{title.id}/reviews/',
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            ):
+                ids = [item['id'] for item in admin_client.get(
+                    url, {'page_size': 100}
+                ).json()['results']]
+                assert ids == sorted(ids, reverse=True), (
+                    'Проверьте, что списки упорядочены по -pub_date, -id'
+                )
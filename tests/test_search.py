@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_search_by_name_and_description(self, admin_client, catalog):
+        title = catalog['titles'][3]
+        title.description = 'История про космический корабль'
+        title.save()
+
+        response = admin_client.get('/api/v1/titles/', {'search': 'корабль'})
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()['results']] == [
+            title.id
+        ], 'Проверьте, что поиск по названию и описанию находит произведение'
+
@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleWrite:
+
+    def test_genres_resolved_in_one_query(self, admin_client, catalog,
+                                          django_assert_max_num_queries):
+        from reviews.models import Title
+
+        payload = {
+            'name': 'Новинка', 'year': 2020, 'description': 'Описание',
+            'category': 'category-1',
+            'genre': [f'genre-{i}' for i in range(6)],
+        }
+        with django_assert_max_num_queries(5):
+            response = admin_client.post(
+                '/api/v1/titles/', payload, format='json'
+            )
+        assert response.status_code == 201
+        assert response.json()['genre'] == payload['genre']
+        assert Title.objects.get(name='Новинка').genre.count() == 6
+
+    def test_unknown_genres_reported_together(self, admin_client, catalog):
+        response = admin_client.post('/api/v1/titles/', {
+            'name': 'Новинка', 'year': 2020, 'description': 'Описание',
+            'category': 'category-1',
+            'genre': ['genre-1', 'unknown-1', 'unknown-2'],
+        }, format='json')
+        assert response.status_code == 400
+        assert response.json()['genre'] == [
+            'Не найдены объекты с slug: unknown-1, unknown-2.'
+        ], 'Проверьте, что все неизвестные слаги перечислены в одной ошибке'
+
+    def test_update_diffs_genre_links(self, admin_client, catalog):
+        from reviews.models import GenreTitle
+
+        title = catalog['titles'][0]
+        kept = GenreTitle.objects.get(title=title, genre__slug='genre-1')
+        response = admin_client.patch(
+            f'/api/v1/titles/{title.id}/',
+            {'genre': ['genre-1', 'genre-3']}, format='json'
+        )
+        assert response.status_code == 200
+        assert response.json()['genre'] == ['genre-1', 'genre-3']
+        assert GenreTitle.objects.filter(pk=kept.pk).exists(), (
+            'Проверьте, что неизменные связи с жанрами не пересоздаются'
+        )
+        assert GenreTitle.objects.filter(title=title).count() == 2